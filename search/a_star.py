@@ -1,49 +1,195 @@
 """
-Implementation of A*.
+Implementation of A*, weighted A* and anytime A*.
 """
 
-from data_utils import PriorityQueue, Set
-from expand import expand
+import time
 
+from data_utils import HeapPriorityQueue, Set
+from expand import expand_with_costs
+from heuristics import heuristic
+from reconstruct import reconstruct_path
 
-def a_star_search(dis_map, time_map, start, end):
+
+def a_star_search(dis_map, time_map, start, end, stats=None, reachability=None):
     """
     Performs A* search algorithm to find the path from start to end.
+    Only the parent of each reached node is stored; the path is rebuilt
+    once the goal is reached.
 
     Args:
-        dis_map (dict): A dictionary containing the distance (hops) map.
-        time_map (dict): A dictionary containing the similarity map.
+        dis_map (dict or Landmarks): A dictionary containing the distance
+                                     (hops) map, or any object with an
+                                     estimate(node, goal) method.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
         start (str): The starting node.
         end (str): The goal node.
+        stats (SearchStats): Optional statistics to record into.
+        reachability (ReachabilityIndex): Optional index to answer pairs in
+                                          different components at once.
 
     Returns:
         list or None: The shortest path from start to end, or None if no path
                       is found.
     """
-    frontier = PriorityQueue()
+    return weighted_a_star_search(dis_map, time_map, start, end, 1, stats, reachability)
+
+
+def weighted_a_star_search(
+    dis_map, time_map, start, end, epsilon, stats=None, reachability=None
+):
+    """
+    Performs weighted A*, which orders the frontier on g + epsilon * h.
+    Trusting the heuristic more makes the search head for the goal and
+    expand fewer nodes; with a consistent heuristic the path found costs
+    at most epsilon times the shortest one. An epsilon of 1 is A*.
+
+    Args:
+        dis_map (dict or Landmarks): A dictionary containing the distance
+                                     (hops) map, or any object with an
+                                     estimate(node, goal) method.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        epsilon (float): The suboptimality bound, at least 1.
+        stats (SearchStats): Optional statistics to record into.
+        reachability (ReachabilityIndex): Optional index to answer pairs in
+                                          different components at once.
+
+    Returns:
+        list or None: A path from start to end costing at most epsilon times
+                      the shortest one, or None if no path is found.
+
+    Raises:
+        ValueError: If epsilon is less than 1.
+    """
+    if epsilon < 1:
+        raise ValueError("epsilon must be at least 1")
+    if stats is not None:
+        stats.start()
+    if reachability is not None and not reachability.connected(start, end):
+        if stats is not None:
+            stats.stop()
+        return None
+    estimate = heuristic(dis_map)
+    frontier = HeapPriorityQueue()
     explored_set = Set()
-    frontier.enqueue(start, [start], 0, dis_map[start][end])
+    frontier.enqueue(start, None, 0, estimate(start, end))
+    if stats is not None:
+        stats.enqueue(start, 1)
+    parents = {start: None}
     g_n_scores = {}
     f_n_scores = {}
     g_n_scores[start] = 0
-    f_n_scores[start] = dis_map[start][end]
+    f_n_scores[start] = epsilon * estimate(start, end)
     while not frontier.is_empty():
-        current_node, path = frontier.dequeue()
+        current_node, _ = frontier.dequeue()
         if current_node == end:
-            return path
+            if stats is not None:
+                stats.stop()
+            return reconstruct_path(parents, end)
         _ = explored_set.enqueue(current_node)
-        for neighbor in expand(current_node, time_map):
+        if stats is not None:
+            stats.expand(current_node)
+        for neighbor, cost in expand_with_costs(current_node, time_map):
             if explored_set.is_exists(neighbor):
+                if stats is not None:
+                    stats.duplicate(neighbor)
                 continue
-            new_g_n_score = g_n_scores[current_node] + time_map[current_node][neighbor]
+            new_g_n_score = g_n_scores[current_node] + cost
+            in_frontier = frontier.is_exists(neighbor)
             # not in frontier or the new g_n_score is lower
-            if (
-                not frontier.is_exists(neighbor)
-                or new_g_n_score <= g_n_scores[neighbor]
-            ):
+            if not in_frontier or new_g_n_score <= g_n_scores[neighbor]:
                 g_n_scores[neighbor] = new_g_n_score
-                h_n_score = dis_map[neighbor][end]
-                f_n_scores[neighbor] = new_g_n_score + h_n_score
-                new_path = path + [neighbor]
-                frontier.enqueue(neighbor, new_path, f_n_scores[neighbor], h_n_score)
+                h_n_score = estimate(neighbor, end)
+                f_n_scores[neighbor] = new_g_n_score + epsilon * h_n_score
+                parents[neighbor] = current_node
+                frontier.enqueue(neighbor, None, f_n_scores[neighbor], h_n_score)
+                if stats is not None and in_frontier:
+                    stats.update(neighbor)
+                elif stats is not None:
+                    stats.enqueue(neighbor, frontier.size())
+            elif stats is not None:
+                stats.duplicate(neighbor)
+    if stats is not None:
+        stats.stop()
     return None
+
+
+def anytime_a_star_search(dis_map, time_map, start, end, epsilon=3, time_limit=None):
+    """
+    Performs anytime weighted A*. It runs weighted A* to find a first path
+    quickly, then keeps searching for cheaper ones: every path found becomes
+    the incumbent, nodes that cannot lead to a cheaper path (g + h at least
+    the incumbent's cost) are pruned, and closed nodes are reopened when a
+    cheaper way to them turns up. When the frontier runs out the last path
+    is the shortest. With a consistent heuristic every bound reported is a
+    true bound on the incumbent's suboptimality.
+
+    Args:
+        dis_map (dict or Landmarks): A dictionary containing the distance
+                                     (hops) map, or any object with an
+                                     estimate(node, goal) method.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        epsilon (float): The heuristic weight of the first search, at
+                         least 1.
+        time_limit (float): Optional seconds after which the search stops
+                            improving the incumbent.
+
+    Yields:
+        tuple: (path, cost, bound) for each cheaper path found, where bound
+               is the incumbent's cost over a lower bound on the shortest
+               cost. The last result has a bound of 1 if the search finished
+               within the time limit. Nothing is yielded if no path is found.
+
+    Raises:
+        ValueError: If epsilon is less than 1.
+    """
+    if epsilon < 1:
+        raise ValueError("epsilon must be at least 1")
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    estimate = heuristic(dis_map)
+    frontier = HeapPriorityQueue()
+    h_n_score = estimate(start, end)
+    frontier.enqueue(start, None, epsilon * h_n_score, h_n_score)
+    parents = {start: None}
+    g_n_scores = {start: 0}
+    best_cost = float("inf")
+    while not frontier.is_empty():
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        current_node, _ = frontier.dequeue()
+        current_g_n_score = g_n_scores[current_node]
+        if current_g_n_score + estimate(current_node, end) >= best_cost:
+            continue
+        if current_node == end:
+            best_cost = current_g_n_score
+            lower_bound = min(
+                [best_cost]
+                + [
+                    g_n_scores[node] + estimate(node, end)
+                    for _, node, _ in frontier.heap
+                ]
+            )
+            bound = best_cost / lower_bound if lower_bound > 0 else 1
+            best_path = reconstruct_path(parents, end)
+            yield best_path, best_cost, bound
+            continue
+        for neighbor, cost in expand_with_costs(current_node, time_map):
+            new_g_n_score = current_g_n_score + cost
+            if neighbor in g_n_scores and new_g_n_score >= g_n_scores[neighbor]:
+                continue
+            h_n_score = estimate(neighbor, end)
+            if new_g_n_score + h_n_score >= best_cost:
+                continue
+            g_n_scores[neighbor] = new_g_n_score
+            parents[neighbor] = current_node
+            frontier.enqueue(
+                neighbor, None, new_g_n_score + epsilon * h_n_score, h_n_score
+            )
+    if best_cost < float("inf") and bound > 1:
+        yield best_path, best_cost, 1
@@ -0,0 +1,39 @@
+"""
+Defines the table of searches that can be run by name.
+"""
+
+from a_star import a_star_search
+from bfs import breadth_first_search
+from bidirectional_a_star import bidirectional_a_star_search
+from bidirectional_bfs import bidirectional_breadth_first_search
+from dfs import (
+    depth_first_search,
+    graph_depth_first_search,
+    iterative_deepening_search,
+)
+from ida_star import ida_star_search
+from ucs import uniform_cost_search
+
+ALGORITHMS = {
+    "bfs": lambda dis_map, time_map, start, end: breadth_first_search(
+        time_map, start, end
+    ),
+    "dfs": lambda dis_map, time_map, start, end: depth_first_search(
+        time_map, start, end
+    ),
+    "graph_dfs": lambda dis_map, time_map, start, end: graph_depth_first_search(
+        time_map, start, end
+    ),
+    "iddfs": lambda dis_map, time_map, start, end: iterative_deepening_search(
+        time_map, start, end
+    ),
+    "ucs": lambda dis_map, time_map, start, end: uniform_cost_search(
+        time_map, start, end
+    ),
+    "bidirectional_bfs": lambda dis_map, time_map, start, end: (
+        bidirectional_breadth_first_search(time_map, start, end)
+    ),
+    "a_star": a_star_search,
+    "bidirectional_a_star": bidirectional_a_star_search,
+    "ida_star": ida_star_search,
+}
@@ -0,0 +1,112 @@
+"""
+Implementation of one-to-many and many-to-many path queries.
+"""
+
+from data_utils import CSRGraph, FIFOQueue
+from expand import expand
+from reconstruct import reconstruct_path
+from ucs import ShortestPathTree, shortest_path_arrays
+
+
+def one_to_many_search(time_map, source, targets, weighted=True):
+    """
+    Finds the paths from one source to many targets with a single search.
+    The search grows one tree from the source and stops as soon as every
+    target has been settled, so the region around the source is explored
+    once instead of once per target.
+
+    With weighted=True the tree is a uniform-cost (Dijkstra) tree over the
+    time_map weights, grown with shortest_path_arrays on a CSRGraph (a
+    dictionary is compiled first), so every path is a cheapest path, as
+    a_star_search returns with an admissible dis_map; between equally cheap
+    paths the choice may differ. With weighted=False the tree is a BFS tree
+    and every path is exactly the one breadth_first_search returns.
+
+    Args:
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        source (str): The starting node.
+        targets (iterable): The goal nodes.
+        weighted (bool): Whether to minimise total time instead of hops.
+
+    Returns:
+        dict: Maps each target to its path from source, or None if no path
+              is found.
+    """
+    if weighted:
+        graph = time_map
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_time_map(time_map)
+        target_ids = [graph.ids[target] for target in targets if target in graph]
+        distances, predecessors = shortest_path_arrays(
+            graph, graph.id_of(source), target_ids
+        )
+        tree = ShortestPathTree(graph.names, source, distances, predecessors, graph.ids)
+        return {
+            target: tree.path_to(target) if target in graph else None
+            for target in targets
+        }
+    parents = _settle_by_hops(time_map, source, set(targets))
+    return {
+        target: reconstruct_path(parents, target) if target in parents else None
+        for target in targets
+    }
+
+
+def many_to_many_search(time_map, pairs, weighted=True):
+    """
+    Finds the paths for many (start, end) pairs. Pairs are grouped by start
+    node and each group is answered with one one_to_many_search; for
+    weighted queries a dictionary is compiled once for all groups.
+
+    Args:
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        pairs (iterable): (start, end) pairs.
+        weighted (bool): Whether to minimise total time instead of hops.
+
+    Returns:
+        dict: Maps each (start, end) pair to its path, or None if no path
+              is found.
+    """
+    targets_by_source = {}
+    for start, end in pairs:
+        targets_by_source.setdefault(start, []).append(end)
+    if weighted and not isinstance(time_map, CSRGraph):
+        time_map = CSRGraph.from_time_map(time_map)
+    paths = {}
+    for source, targets in targets_by_source.items():
+        for target, path in one_to_many_search(
+            time_map, source, targets, weighted
+        ).items():
+            paths[(source, target)] = path
+    return paths
+
+
+def _settle_by_hops(time_map, source, pending):
+    """
+    Grows a BFS tree from source until every pending target is dequeued.
+    Nodes are enqueued once and in the same order as breadth_first_search,
+    so the parents are the ones it would record.
+
+    Args:
+        time_map (dict or CSRGraph): The adjacency map.
+        source (str): The starting node.
+        pending (set): Targets still to settle; emptied as they are found.
+
+    Returns:
+        dict: The parent map of the tree, restricted to the explored region.
+    """
+    frontier = FIFOQueue()
+    frontier.enqueue(source, None)
+    parents = {source: None}
+    while pending and not frontier.is_empty():
+        current_node, _ = frontier.dequeue()
+        pending.discard(current_node)
+        if not pending:
+            break
+        for child_node in expand(current_node, time_map):
+            if child_node not in parents:
+                parents[child_node] = current_node
+                frontier.enqueue(child_node, None)
+    return parents
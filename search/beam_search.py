@@ -0,0 +1,176 @@
+"""
+Implementation of beam search.
+"""
+
+import heapq
+
+from data_utils import HeapPriorityQueue, Set
+from expand import expand_with_costs
+from heuristics import heuristic
+from reconstruct import reconstruct_path
+
+BEST_FIRST = "best_first"
+BREADTH_FIRST = "breadth_first"
+
+
+def beam_search(dis_map, time_map, start, end, width, mode=BEST_FIRST, stats=None):
+    """
+    Performs beam search, an A* whose frontier never holds more than width
+    nodes, so each query has a fixed memory and latency ceiling however
+    wide the graph fans out. Nodes beyond the beam are pruned by f-score,
+    worst first. In BEST_FIRST mode the whole frontier is capped and
+    nodes are expanded one at a time by f-score. In BREADTH_FIRST mode the
+    graph is expanded one hop layer at a time and each layer is cut to its
+    width best nodes.
+
+    Pruned nodes can be reached again later by another path, but pruning
+    still makes the search incomplete and suboptimal: when anything was
+    pruned, None does not prove there is no path and a path found may not
+    be the shortest. The pruned count returned says whether that happened.
+
+    Args:
+        dis_map (dict or Landmarks): A dictionary containing the distance
+                                     (hops) map, or any object with an
+                                     estimate(node, goal) method.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        width (int): The most nodes kept in the frontier (BEST_FIRST) or in
+                     each layer (BREADTH_FIRST).
+        mode (str): BEST_FIRST or BREADTH_FIRST.
+        stats (SearchStats): Optional statistics to record into.
+
+    Returns:
+        tuple: (path, pruned), where path is the path from start to end or
+               None if none was found, and pruned is the number of nodes
+               dropped from the beam; 0 means the result is what an
+               unbounded search would give.
+
+    Raises:
+        ValueError: If width is less than 1 or mode is unknown.
+    """
+    if width < 1:
+        raise ValueError("width must be at least 1")
+    if mode == BEST_FIRST:
+        search = _best_first
+    elif mode == BREADTH_FIRST:
+        search = _breadth_first
+    else:
+        raise ValueError(f"Unknown beam search mode: {mode}")
+    if stats is not None:
+        stats.start()
+    result = search(heuristic(dis_map), time_map, start, end, width, stats)
+    if stats is not None:
+        stats.stop()
+    return result
+
+
+def _best_first(estimate, time_map, start, end, width, stats):
+    """
+    Runs A* with the frontier capped at width nodes. A max-heap of
+    (-f, -h, -sequence, node) entries alongside the frontier finds the
+    worst node to evict; entries for nodes that have since left the
+    frontier or changed priority are skipped when they surface.
+    """
+    frontier = HeapPriorityQueue()
+    worst = []
+    sequence = 0
+    explored_set = Set()
+    g_n_scores = {start: 0}
+    parents = {start: None}
+    pruned = 0
+    h_n_score = estimate(start, end)
+    frontier.enqueue(start, None, h_n_score, h_n_score)
+    worst.append((-h_n_score, -h_n_score, 0, start))
+    if stats is not None:
+        stats.enqueue(start, 1)
+    while not frontier.is_empty():
+        current_node, _ = frontier.dequeue()
+        if current_node == end:
+            return reconstruct_path(parents, end), pruned
+        _ = explored_set.enqueue(current_node)
+        if stats is not None:
+            stats.expand(current_node)
+        for neighbor, cost in expand_with_costs(current_node, time_map):
+            if explored_set.is_exists(neighbor):
+                if stats is not None:
+                    stats.duplicate(neighbor)
+                continue
+            new_g_n_score = g_n_scores[current_node] + cost
+            in_frontier = frontier.is_exists(neighbor)
+            if in_frontier and new_g_n_score > g_n_scores[neighbor]:
+                if stats is not None:
+                    stats.duplicate(neighbor)
+                continue
+            h_n_score = estimate(neighbor, end)
+            f_n_score = new_g_n_score + h_n_score
+            if not in_frontier and frontier.size() >= width:
+                # evict the worst node, or drop this one if it is no better
+                while worst and (
+                    not frontier.is_exists(worst[0][3])
+                    or frontier.get_priority(worst[0][3])
+                    != (-worst[0][0], -worst[0][1])
+                ):
+                    heapq.heappop(worst)
+                pruned += 1
+                if (-worst[0][0], -worst[0][1]) <= (f_n_score, h_n_score):
+                    continue
+                frontier.remove(heapq.heappop(worst)[3])
+            g_n_scores[neighbor] = new_g_n_score
+            parents[neighbor] = current_node
+            frontier.enqueue(neighbor, None, f_n_score, h_n_score)
+            sequence += 1
+            heapq.heappush(worst, (-f_n_score, -h_n_score, -sequence, neighbor))
+            if stats is not None and in_frontier:
+                stats.update(neighbor)
+            elif stats is not None:
+                stats.enqueue(neighbor, frontier.size())
+    return None, pruned
+
+
+def _breadth_first(estimate, time_map, start, end, width, stats):
+    """
+    Expands one hop layer at a time, keeping the width nodes of each new
+    layer with the lowest f-scores. Nodes are only ever placed in one
+    layer, like in breadth_first_search.
+    """
+    if start == end:
+        return [start], 0
+    g_n_scores = {start: 0}
+    parents = {start: None}
+    pruned = 0
+    layer = [start]
+    if stats is not None:
+        stats.enqueue(start, 1)
+    while layer:
+        candidates = {}
+        for current_node in layer:
+            if stats is not None:
+                stats.expand(current_node)
+            for neighbor, cost in expand_with_costs(current_node, time_map):
+                new_g_n_score = g_n_scores[current_node] + cost
+                if neighbor in parents and neighbor not in candidates:
+                    if stats is not None:
+                        stats.duplicate(neighbor)
+                    continue
+                if neighbor in candidates and new_g_n_score >= g_n_scores[neighbor]:
+                    if stats is not None:
+                        stats.duplicate(neighbor)
+                    continue
+                g_n_scores[neighbor] = new_g_n_score
+                parents[neighbor] = current_node
+                candidates[neighbor] = new_g_n_score + estimate(neighbor, end)
+        if end in candidates:
+            return reconstruct_path(parents, end), pruned
+        layer = sorted(candidates, key=candidates.get)
+        pruned += max(0, len(layer) - width)
+        for node in layer[width:]:
+            # forget pruned nodes so a later layer can reach them again
+            del parents[node]
+            del g_n_scores[node]
+        layer = layer[:width]
+        if stats is not None:
+            for node in layer:
+                stats.enqueue(node, len(layer))
+    return None, pruned
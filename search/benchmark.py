@@ -0,0 +1,207 @@
+"""
+Benchmark suite for bfs, dfs and A* on generated social graphs.
+
+Usage: python benchmark.py [--models M ...] [--sizes N ...] [--queries Q]
+                           [--algorithms A ...] [--seed S] [--output FILE]
+
+Prints one JSON document with, for every graph model, size and algorithm,
+the p50/p99 latency, SearchStats counters and peak traced memory over
+the same random query pairs.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from a_star import a_star_search
+from bfs import breadth_first_search
+from dfs import depth_first_search, graph_depth_first_search
+from graph_generators import DENSE_DIS_MAP_LIMIT, MODELS, to_time_map
+from hop_table import HopTable
+from landmarks import Landmarks
+from percentile import percentile
+from search_stats import SearchStats
+
+ALGORITHMS = {
+    "bfs": lambda dis_map, time_map, start, end, stats: breadth_first_search(
+        time_map, start, end, stats
+    ),
+    "dfs": lambda dis_map, time_map, start, end, stats: depth_first_search(
+        time_map, start, end, stats
+    ),
+    "graph_dfs": lambda dis_map, time_map, start, end, stats: (
+        graph_depth_first_search(time_map, start, end, stats)
+    ),
+    "a_star": a_star_search,
+}
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised when a query expands more nodes than the benchmark allows.
+    """
+
+
+def budget_stats(max_expansions):
+    """
+    Gets SearchStats whose expand hook stops the search once it has
+    expanded more than max_expansions nodes.
+
+    Args:
+        max_expansions (int): The expansions allowed.
+
+    Returns:
+        SearchStats: The statistics to pass to the search.
+    """
+
+    def check_budget(node):
+        if stats.expanded > max_expansions:
+            raise BudgetExceeded()
+
+    stats = SearchStats(on_expand=check_budget)
+    return stats
+
+
+def summarize(samples):
+    """
+    Summarizes samples as p50, p99, mean and max.
+
+    Args:
+        samples (list): The samples.
+
+    Returns:
+        dict: The summary.
+    """
+    return {
+        "p50": percentile(samples, 0.5),
+        "p99": percentile(samples, 0.99),
+        "mean": sum(samples) / len(samples) if samples else None,
+        "max": max(samples) if samples else None,
+    }
+
+
+def benchmark_graph(model, nodes, args):
+    """
+    Generates one graph and benchmarks every algorithm on it.
+
+    Args:
+        model (str): A key of MODELS.
+        nodes (int): The number of people.
+        args (argparse.Namespace): The command-line options.
+
+    Returns:
+        list: One result dictionary per algorithm.
+    """
+    started = time.perf_counter()
+    graph = MODELS[model](nodes, seed=args.seed)
+    time_map = to_time_map(graph)
+    if nodes <= args.dense_dis_map_limit:
+        dis_map, heuristic_name = HopTable.build(graph), "hop_table"
+    else:
+        dis_map, heuristic_name = Landmarks(graph, k=args.landmarks), "landmarks"
+    setup_seconds = time.perf_counter() - started
+    rng = random.Random(args.seed)
+    pairs = [tuple(rng.sample(graph.names, 2)) for _ in range(args.queries)]
+    max_expansions = args.budget * nodes
+
+    results = []
+    for algorithm in args.algorithms:
+        search = ALGORITHMS[algorithm]
+        latencies, expanded, enqueued, duplicates, frontiers = [], [], [], [], []
+        found = exceeded = 0
+        for start, end in pairs:
+            stats = budget_stats(max_expansions)
+            try:
+                path = search(dis_map, time_map, start, end, stats)
+            except BudgetExceeded:
+                exceeded += 1
+                continue
+            latencies.append(stats.wall_time * 1000)
+            expanded.append(stats.expanded)
+            enqueued.append(stats.enqueued)
+            duplicates.append(stats.duplicates)
+            frontiers.append(stats.peak_frontier)
+            found += path is not None
+        memory = []
+        if args.memory:
+            for start, end in pairs:
+                tracemalloc.start()
+                try:
+                    stats = budget_stats(max_expansions)
+                    search(dis_map, time_map, start, end, stats)
+                except BudgetExceeded:
+                    pass
+                memory.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        result = {
+            "model": model,
+            "nodes": graph.node_count(),
+            "edges": graph.edge_count(),
+            "heuristic": heuristic_name,
+            "setup_seconds": setup_seconds,
+            "algorithm": algorithm,
+            "queries": len(pairs),
+            "found": found,
+            "budget_exceeded": exceeded,
+            "latency_ms": summarize(latencies),
+            "nodes_expanded": summarize(expanded),
+            "enqueues": summarize(enqueued),
+            "duplicates": summarize(duplicates),
+            "peak_frontier": summarize(frontiers),
+            "peak_memory_bytes": summarize(memory),
+        }
+        print(
+            f"{model} {nodes} {algorithm}: {found}/{len(pairs)} found, "
+            f"{exceeded} over budget",
+            file=sys.stderr,
+        )
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+", default=sorted(MODELS), choices=MODELS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument(
+        "--algorithms", nargs="+", default=sorted(ALGORITHMS), choices=ALGORITHMS
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=10,
+        help="expansions allowed per query, as a multiple of the node count",
+    )
+    parser.add_argument("--dense-dis-map-limit", type=int, default=DENSE_DIS_MAP_LIMIT)
+    parser.add_argument("--landmarks", type=int, default=8)
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": [
+            result
+            for model in args.models
+            for nodes in args.sizes
+            for result in benchmark_graph(model, nodes, args)
+        ],
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of contraction-hierarchy queries against plain A*.
+
+Usage: python benchmark_contraction.py [--nodes N] [--queries Q] [--seed S]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from a_star import a_star_search
+from contraction import ContractionHierarchy
+from graph_generators import small_world_graph
+from percentile import percentile
+
+
+class ZeroEstimate:
+    """
+    A heuristic that always estimates 0, which makes A* plain Dijkstra.
+    Generated graphs have no dis_map to guide it.
+    """
+
+    def estimate(self, node, goal):
+        """
+        Estimates the cost from node to goal.
+
+        Returns:
+            int: Always 0.
+        """
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    graph = small_world_graph(args.nodes, seed=args.seed)
+    print(f"Graph: {graph.node_count()} nodes, {graph.edge_count()} edges")
+
+    started = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(graph)
+    print(f"Preprocessing: {time.perf_counter() - started:.1f} s")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "graph.ch")
+        hierarchy.save(filename)
+        started = time.perf_counter()
+        hierarchy = ContractionHierarchy.load(filename)
+        print(
+            f"Load: {(time.perf_counter() - started) * 1000:.1f} ms, "
+            f"{os.path.getsize(filename) / 2 ** 20:.1f} MiB on disk"
+        )
+
+    pairs = [tuple(rng.sample(graph.names, 2)) for _ in range(args.queries)]
+    heuristic = ZeroEstimate()
+    latencies = {"a_star_search": [], "ContractionHierarchy": []}
+    for start, end in pairs:
+        started = time.perf_counter()
+        expected = a_star_search(heuristic, graph, start, end)
+        latencies["a_star_search"].append(time.perf_counter() - started)
+        started = time.perf_counter()
+        path = hierarchy.shortest_path(start, end)
+        latencies["ContractionHierarchy"].append(time.perf_counter() - started)
+        assert _cost(graph, path) == _cost(graph, expected)
+    for name, samples in latencies.items():
+        print(
+            f"{name}: mean {statistics.mean(samples) * 1000:.3f} ms, "
+            f"p50 {percentile(samples, 0.5) * 1000:.3f} ms, "
+            f"p99 {percentile(samples, 0.99) * 1000:.3f} ms"
+        )
+    speedup = statistics.mean(latencies["a_star_search"]) / statistics.mean(
+        latencies["ContractionHierarchy"]
+    )
+    print(f"Speedup: {speedup:.0f}x")
+
+
+def _cost(graph, path):
+    """
+    Adds up the edge weights along a path.
+    """
+    return sum(graph.weight(source, target) for source, target in zip(path, path[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark of ParallelSearchRunner throughput from 1 to N worker processes.
+
+Usage: python benchmark_parallel.py [--nodes N] [--queries Q]
+                                    [--max-workers W] [--chunksize C]
+"""
+
+import argparse
+import multiprocessing
+import random
+import time
+
+from algorithms import ALGORITHMS
+from graph_generators import small_world_graph
+from landmarks import Landmarks
+from parallel import ParallelSearchRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--algorithm", default="a_star")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    graph = small_world_graph(args.nodes, seed=args.seed)
+    landmarks = Landmarks(graph, k=4)
+    jobs = [
+        (args.algorithm,) + tuple(rng.sample(graph.names, 2))
+        for _ in range(args.queries)
+    ]
+    print(f"Graph: {graph.node_count()} nodes, {graph.edge_count()} edges")
+    print(f"CPUs: {multiprocessing.cpu_count()}")
+    started = time.perf_counter()
+    for algorithm, start, end in jobs:
+        ALGORITHMS[algorithm](landmarks, graph, start, end)
+    baseline = len(jobs) / (time.perf_counter() - started)
+    print(f"in-process: {baseline:.1f} queries/s, 1.00x")
+    for workers in range(1, args.max_workers + 1):
+        with ParallelSearchRunner(graph, landmarks, workers) as runner:
+            started = time.perf_counter()
+            completed = sum(1 for _ in runner.run(jobs, args.chunksize))
+            elapsed = time.perf_counter() - started
+        throughput = completed / elapsed
+        print(
+            f"{workers} workers: {throughput:.1f} queries/s, "
+            f"{throughput / baseline:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of graph traversals before and after node reordering.
+
+Usage: python benchmark_reorder.py [--nodes N] [--model M] [--sources K]
+                                   [--seed S]
+
+The generators number people along the lattice they are built on, which
+is already a local order, so the baseline shuffles the ids first, as data
+inserted in no particular order would be.
+"""
+
+import argparse
+import random
+import time
+
+from bfs import breadth_first_search
+from graph_generators import MODELS
+from level_bfs import breadth_first_levels
+from reorder import ORDERINGS, renumber, reorder
+from ucs import ShortestPathTree
+
+
+def time_traversals(graph, sources):
+    """
+    Times a level-synchronous BFS and a full uniform-cost search from each
+    source, both of which walk the CSR arrays by node id.
+
+    Args:
+        graph (CSRGraph): The graph.
+        sources (list): The source node names.
+
+    Returns:
+        dict: The total seconds of each traversal, and the hop distances by
+              name of the first source.
+    """
+    started = time.perf_counter()
+    for source in sources:
+        distances, _ = breadth_first_levels(graph, source)
+    levels_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for source in sources:
+        ShortestPathTree.build(graph, source)
+    ucs_seconds = time.perf_counter() - started
+    distances, _ = breadth_first_levels(graph, sources[0])
+    return {
+        "level_bfs": levels_seconds,
+        "ucs_tree": ucs_seconds,
+        "hops": dict(zip(graph.names, distances)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--model", choices=sorted(MODELS), default="small_world")
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    graph = MODELS[args.model](args.nodes, seed=args.seed)
+    shuffled = list(range(graph.node_count()))
+    rng.shuffle(shuffled)
+    graph = renumber(graph, shuffled)
+    print(f"Graph: {graph.node_count()} nodes, {graph.edge_count()} edges")
+    sources = rng.sample(graph.names, args.sources)
+    end = rng.choice(graph.names)
+
+    baseline = time_traversals(graph, sources)
+    print(
+        f"shuffled: level_bfs {baseline['level_bfs'] * 1000:.0f} ms, "
+        f"ucs_tree {baseline['ucs_tree'] * 1000:.0f} ms"
+    )
+    expected_path = breadth_first_search(graph, sources[0], end)
+    for method in ORDERINGS:
+        started = time.perf_counter()
+        reordered = reorder(graph, method)
+        reorder_seconds = time.perf_counter() - started
+        result = time_traversals(reordered, sources)
+        assert result["hops"] == baseline["hops"]
+        assert breadth_first_search(reordered, sources[0], end) == expected_path
+        print(
+            f"{method}: reorder {reorder_seconds * 1000:.0f} ms, "
+            f"level_bfs {result['level_bfs'] * 1000:.0f} ms "
+            f"({baseline['level_bfs'] / result['level_bfs']:.2f}x), "
+            f"ucs_tree {result['ucs_tree'] * 1000:.0f} ms "
+            f"({baseline['ucs_tree'] / result['ucs_tree']:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
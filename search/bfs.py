@@ -4,33 +4,58 @@ Implementation of BFS.
 
 from data_utils import FIFOQueue, Set
 from expand import expand
+from reconstruct import reconstruct_path
 
 
-def breadth_first_search(time_map, start, end):
+def breadth_first_search(time_map, start, end, stats=None, reachability=None):
     """
     Performs Breadth-First Search (BFS) algorithm to find the path
-    from start to end.
+    from start to end. Only the parent of each discovered node is stored;
+    the path is rebuilt once the goal is reached.
 
     Args:
-        time_map (dict): A dictionary containing the similarity map.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
         start (str): The starting node.
         end (str): The goal node.
+        stats (SearchStats): Optional statistics to record into.
+        reachability (ReachabilityIndex): Optional index to answer pairs in
+                                          different components at once.
 
     Returns:
         list or None: The path from start to end, or None if no path is found.
     """
+    if stats is not None:
+        stats.start()
+    if reachability is not None and not reachability.connected(start, end):
+        if stats is not None:
+            stats.stop()
+        return None
     frontier = FIFOQueue()
-    frontier.enqueue(start, [start])
+    frontier.enqueue(start, None)
+    if stats is not None:
+        stats.enqueue(start, 1)
     explored_set = Set()
+    parents = {start: None}
     while not frontier.is_empty():
-        current_node, path = frontier.dequeue()
+        current_node, _ = frontier.dequeue()
         _ = explored_set.enqueue(current_node)
         if current_node == end:
-            return path
+            if stats is not None:
+                stats.stop()
+            return reconstruct_path(parents, end)
+        if stats is not None:
+            stats.expand(current_node)
         for child_node in expand(current_node, time_map):
             if not frontier.is_exists(child_node) and not explored_set.is_exists(
                 child_node
             ):
-                new_path = path + [child_node]
-                frontier.enqueue(child_node, new_path)
+                parents[child_node] = current_node
+                frontier.enqueue(child_node, None)
+                if stats is not None:
+                    stats.enqueue(child_node, frontier.size())
+            elif stats is not None:
+                stats.duplicate(child_node)
+    if stats is not None:
+        stats.stop()
     return None
@@ -0,0 +1,115 @@
+"""
+Implementation of bidirectional A*.
+"""
+
+from bidirectional_bfs import join_paths
+from data_utils import HeapPriorityQueue
+from expand import expand_predecessors, expand_with_costs
+from heuristics import heuristic
+
+
+def bidirectional_a_star_search(dis_map, time_map, start, end):
+    """
+    Performs A* from both start and end at once. The forward search is
+    guided by the estimate from node to end and the backward search, which
+    follows edges in reverse, by the estimate from start to node. Whenever
+    a node has been reached from both sides the cost of the joined path is
+    recorded, and the search stops once the cheapest joined path costs no
+    more than the larger of the two smallest f-scores left in the
+    frontiers. No unexplored path can beat that bound, so with an
+    admissible dis_map the returned path is a shortest path. Nodes are
+    re-opened when a cheaper route to them is found, so this also holds for
+    inconsistent heuristics.
+
+    Args:
+        dis_map (dict or Landmarks): A dictionary containing the distance
+                                     (hops) map, or any object with an
+                                     estimate(node, goal) method.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+
+    Returns:
+        list or None: The shortest path from start to end, or None if no path
+                      is found.
+    """
+    if start == end:
+        return [start]
+    estimate = heuristic(dis_map)
+    forward = _Side(
+        lambda node: estimate(node, end),
+        lambda node: expand_with_costs(node, time_map),
+    )
+    backward = _Side(
+        lambda node: estimate(start, node),
+        lambda node: expand_predecessors(node, time_map),
+    )
+    forward.open(start, None, 0)
+    backward.open(end, None, 0)
+    best_cost = float("inf")
+    meeting_node = None
+    while not forward.frontier.is_empty() and not backward.frontier.is_empty():
+        if best_cost <= max(forward.min_f_score(), backward.min_f_score()):
+            break
+        if forward.frontier.size() <= backward.frontier.size():
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        current_node, _ = side.frontier.dequeue()
+        for neighbor, cost in side.children_of(current_node):
+            new_g_n_score = side.g_n_scores[current_node] + cost
+            if new_g_n_score >= side.g_n_scores.get(neighbor, float("inf")):
+                continue
+            side.open(neighbor, current_node, new_g_n_score)
+            if neighbor in other.g_n_scores:
+                joined_cost = new_g_n_score + other.g_n_scores[neighbor]
+                if joined_cost < best_cost:
+                    best_cost = joined_cost
+                    meeting_node = neighbor
+    if meeting_node is None:
+        return None
+    return join_paths(forward.parents, backward.parents, meeting_node)
+
+
+class _Side:
+    """
+    Holds the search state of one direction of a bidirectional A*.
+
+    Attributes:
+        heuristic: Returns the estimated cost from a node to this side's goal.
+        children_of: Returns (node, cost) pairs reachable in one step.
+        frontier: Priority queue ordered on f-score, tie-broken on h-score.
+        g_n_scores: Cheapest known cost from this side's origin to each node.
+        parents: Parent of each reached node on its cheapest known path.
+    """
+
+    def __init__(self, heuristic, children_of):
+        self.heuristic = heuristic
+        self.children_of = children_of
+        self.frontier = HeapPriorityQueue()
+        self.g_n_scores = {}
+        self.parents = {}
+
+    def open(self, node, parent, g_n_score):
+        """
+        Records a cheaper path to a node and (re-)enqueues it.
+
+        Args:
+            node (str): The node reached.
+            parent (str): The node it was reached from.
+            g_n_score (float): The cost of the path to node.
+        """
+        self.g_n_scores[node] = g_n_score
+        self.parents[node] = parent
+        h_n_score = self.heuristic(node)
+        self.frontier.enqueue(node, None, g_n_score + h_n_score, h_n_score)
+
+    def min_f_score(self):
+        """
+        Gets the smallest f-score in the frontier.
+
+        Returns:
+            float: The f-score of the front element.
+        """
+        return self.frontier.peek_priority()[0]
@@ -0,0 +1,100 @@
+"""
+Implementation of bidirectional BFS.
+"""
+
+from expand import expand, expand_predecessors
+from reconstruct import reconstruct_path
+
+
+def bidirectional_breadth_first_search(time_map, start, end):
+    """
+    Performs Breadth-First Search from both start and end at once and stops
+    when the two searches meet. Each step expands one whole level of the
+    smaller frontier. The frontiers only ever hold nodes the other side has
+    not reached, so the first meeting found lies on a path with the fewest
+    hops and only about 2 * b^(d/2) nodes are explored instead of b^d.
+    When several shortest paths exist, the one returned may differ from
+    breadth_first_search's.
+
+    Args:
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+
+    Returns:
+        list or None: The path from start to end, or None if no path is found.
+    """
+    if start == end:
+        return [start]
+    forward_parents = {start: None}
+    backward_parents = {end: None}
+    forward_frontier = [start]
+    backward_frontier = [end]
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting_node = _expand_level(
+                forward_frontier,
+                forward_parents,
+                backward_parents,
+                lambda node: expand(node, time_map),
+            )
+        else:
+            backward_frontier, meeting_node = _expand_level(
+                backward_frontier,
+                backward_parents,
+                forward_parents,
+                lambda node: [prev for prev, _ in expand_predecessors(node, time_map)],
+            )
+        if meeting_node is not None:
+            return join_paths(forward_parents, backward_parents, meeting_node)
+    return None
+
+
+def _expand_level(frontier, parents, other_parents, children_of):
+    """
+    Expands every node of one BFS level.
+
+    Args:
+        frontier (list): The nodes of the current level.
+        parents (dict): The parent map of the side being expanded.
+        other_parents (dict): The parent map of the opposite side.
+        children_of (callable): Returns the nodes reachable in one step.
+
+    Returns:
+        tuple: The next level and the meeting node, or None if the two
+               sides have not met.
+    """
+    next_frontier = []
+    for current_node in frontier:
+        for child_node in children_of(current_node):
+            if child_node in parents:
+                continue
+            parents[child_node] = current_node
+            if child_node in other_parents:
+                return next_frontier, child_node
+            next_frontier.append(child_node)
+    return next_frontier, None
+
+
+def join_paths(forward_parents, backward_parents, meeting_node):
+    """
+    Joins the two halves of a bidirectional search at the meeting node.
+
+    Args:
+        forward_parents (dict): Maps each node reached from the start to its
+                                parent. The start maps to None.
+        backward_parents (dict): Maps each node reached from the goal to the
+                                 next node towards the goal. The goal maps
+                                 to None.
+        meeting_node (str): A node reached by both searches.
+
+    Returns:
+        list: The path from the start to the goal through meeting_node.
+    """
+    path = reconstruct_path(forward_parents, meeting_node)
+    node = backward_parents[meeting_node]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+    return path
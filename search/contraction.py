@@ -0,0 +1,419 @@
+"""
+Implementation of contraction hierarchies for repeated path queries.
+"""
+
+import heapq
+import pickle
+from array import array
+
+from data_utils import CSRGraph
+
+INFINITY = float("inf")
+# witness searches that only score a node for contraction order settle
+# fewer nodes; overcounting shortcuts there only affects the order
+PRIORITY_WITNESS_LIMIT = 5
+
+
+class ContractionHierarchy:
+    """
+    Represents a contraction hierarchy (CH) over a time_map. Preprocessing
+    contracts the nodes one by one in order of importance; whenever removing
+    a node would lengthen a shortest path between two of its neighbors, a
+    shortcut edge replaces that path. A query then only needs to search
+    upwards, towards more important nodes, from both ends, which touches a
+    few hundred nodes even on large graphs. Shortcuts remember the node they
+    bypass, so paths are unpacked to the same name lists a_star_search
+    returns.
+
+    Each node keeps the edges it still had when it was contracted, which
+    all lead to more important nodes. Upward edges out of node i are in
+    CSR row i of the up arrays and upward edges into node i are in CSR row
+    i of the down arrays. A middle of -1 marks an original edge.
+
+    Attributes:
+        names: List mapping each node id to its name.
+        ids: Dictionary mapping each node name to its id.
+        rank: Array giving the contraction order of each node id.
+        up: (offsets, targets, weights, middles) arrays of the upward edges
+            leaving each node.
+        down: (offsets, sources, weights, middles) arrays of the upward
+              edges entering each node.
+    """
+
+    def __init__(self, names, rank, up, down):
+        """
+        Initializes a ContractionHierarchy from already built arrays. Use
+        build() or load() to create one.
+
+        Args:
+            names (list): Node names indexed by node id.
+            rank (array): Contraction order of each node id.
+            up (tuple): The upward out-edge arrays.
+            down (tuple): The upward in-edge arrays.
+        """
+        self.names = names
+        self.ids = {name: node_id for node_id, name in enumerate(names)}
+        self.rank = rank
+        self.up = up
+        self.down = down
+
+    @classmethod
+    def build(cls, time_map, witness_limit=50):
+        """
+        Builds a contraction hierarchy. Nodes are contracted in order of
+        edge difference (shortcuts added minus edges removed) plus the
+        number of already contracted neighbors, which spreads contraction
+        evenly over the graph. Priorities are updated lazily: the cheapest
+        node is re-scored before it is contracted and pushed back if it is
+        no longer the cheapest.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            witness_limit (int): The most nodes a witness search may settle
+                                 before giving up and adding the shortcut.
+                                 Smaller values preprocess faster but add
+                                 more shortcuts.
+
+        Returns:
+            ContractionHierarchy: The built hierarchy.
+        """
+        if isinstance(time_map, dict):
+            time_map = CSRGraph.from_time_map(time_map)
+        contractor = _Contractor(time_map, witness_limit)
+        return contractor.run()
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads a hierarchy written by save().
+
+        Args:
+            filename (str): The file to read.
+
+        Returns:
+            ContractionHierarchy: The loaded hierarchy.
+        """
+        with open(filename, "rb") as file:
+            state = pickle.load(file)
+        return cls(state["names"], state["rank"], state["up"], state["down"])
+
+    def save(self, filename):
+        """
+        Writes the hierarchy to disk.
+
+        Args:
+            filename (str): The file to write.
+        """
+        state = {
+            "names": self.names,
+            "rank": self.rank,
+            "up": self.up,
+            "down": self.down,
+        }
+        with open(filename, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def shortest_path(self, start, end):
+        """
+        Finds a cheapest path from start to end with an upward bidirectional
+        Dijkstra search. Each direction stops once its smallest key is no
+        smaller than the cheapest meeting found.
+
+        Args:
+            start (str): The starting node.
+            end (str): The goal node.
+
+        Returns:
+            list or None: The shortest path from start to end, or None if no
+                          path is found.
+        """
+        start_id, end_id = self.ids[start], self.ids[end]
+        if start_id == end_id:
+            return [start]
+        forward_distances, forward_parents = {start_id: 0}, {start_id: -1}
+        backward_distances, backward_parents = {end_id: 0}, {end_id: -1}
+        forward_heap, backward_heap = [(0, start_id)], [(0, end_id)]
+        best_cost, meeting_id = INFINITY, -1
+        while forward_heap or backward_heap:
+            if forward_heap and forward_heap[0][0] >= best_cost:
+                forward_heap = []
+            if backward_heap and backward_heap[0][0] >= best_cost:
+                backward_heap = []
+            if forward_heap and (
+                not backward_heap or forward_heap[0][0] <= backward_heap[0][0]
+            ):
+                heap, distances, parents = (
+                    forward_heap,
+                    forward_distances,
+                    forward_parents,
+                )
+                other_distances, edges = backward_distances, self.up
+            elif backward_heap:
+                heap, distances, parents = (
+                    backward_heap,
+                    backward_distances,
+                    backward_parents,
+                )
+                other_distances, edges = forward_distances, self.down
+            else:
+                break
+            distance, node_id = heapq.heappop(heap)
+            if distance > distances[node_id]:
+                continue
+            if node_id in other_distances:
+                joined_cost = distance + other_distances[node_id]
+                if joined_cost < best_cost:
+                    best_cost, meeting_id = joined_cost, node_id
+            offsets, others, weights, _ = edges
+            row_start, row_stop = offsets[node_id], offsets[node_id + 1]
+            for other_id, weight in zip(
+                others[row_start:row_stop], weights[row_start:row_stop]
+            ):
+                new_distance = distance + weight
+                if new_distance < distances.get(other_id, INFINITY):
+                    distances[other_id] = new_distance
+                    parents[other_id] = node_id
+                    heapq.heappush(heap, (new_distance, other_id))
+        if meeting_id == -1:
+            return None
+        node_ids = []
+        node_id = meeting_id
+        while node_id != -1:
+            node_ids.append(node_id)
+            node_id = forward_parents[node_id]
+        node_ids.reverse()
+        node_id = backward_parents[meeting_id]
+        while node_id != -1:
+            node_ids.append(node_id)
+            node_id = backward_parents[node_id]
+        path = [start]
+        for source_id, target_id in zip(node_ids, node_ids[1:]):
+            self._unpack(source_id, target_id, path)
+        return path
+
+    def _unpack(self, source_id, target_id, path):
+        """
+        Appends the original nodes of a (possibly shortcut) edge to path,
+        excluding its source.
+
+        Args:
+            source_id (int): The id of the edge's source.
+            target_id (int): The id of the edge's target.
+            path (list): The path being built, ending at the source.
+        """
+        stack = [(source_id, target_id)]
+        while stack:
+            source_id, target_id = stack.pop()
+            middle_id = self._middle(source_id, target_id)
+            if middle_id == -1:
+                path.append(self.names[target_id])
+            else:
+                stack.append((middle_id, target_id))
+                stack.append((source_id, middle_id))
+
+    def _middle(self, source_id, target_id):
+        """
+        Gets the node bypassed by the cheapest edge from source to target.
+        The edge is stored with whichever endpoint was contracted first.
+
+        Args:
+            source_id (int): The id of the edge's source.
+            target_id (int): The id of the edge's target.
+
+        Returns:
+            int: The bypassed node id, or -1 for an original edge.
+        """
+        if self.rank[source_id] < self.rank[target_id]:
+            (offsets, others, weights, middles), row_id, other_id = (
+                self.up,
+                source_id,
+                target_id,
+            )
+        else:
+            (offsets, others, weights, middles), row_id, other_id = (
+                self.down,
+                target_id,
+                source_id,
+            )
+        best_index = -1
+        for index in range(offsets[row_id], offsets[row_id + 1]):
+            if others[index] == other_id and (
+                best_index == -1 or weights[index] < weights[best_index]
+            ):
+                best_index = index
+        return middles[best_index]
+
+
+class _Contractor:
+    """
+    Holds the shrinking graph while a ContractionHierarchy is built.
+
+    Attributes:
+        graph: The CSRGraph being contracted.
+        witness_limit: The most nodes a witness search may settle.
+        out_edges: For each uncontracted node, {target: (weight, middle)}.
+        in_edges: For each uncontracted node, {source: (weight, middle)}.
+        contracted_neighbors: Number of contracted neighbors of each node.
+        rank: Contraction order of each node, -1 until contracted.
+    """
+
+    def __init__(self, graph, witness_limit):
+        self.graph = graph
+        self.witness_limit = witness_limit
+        node_count = graph.node_count()
+        self.out_edges = [{} for _ in range(node_count)]
+        self.in_edges = [{} for _ in range(node_count)]
+        for source_id in range(node_count):
+            for index in range(graph.offsets[source_id], graph.offsets[source_id + 1]):
+                target_id = graph.neighbors[index]
+                if target_id != source_id:
+                    self._add_edge(source_id, target_id, graph.weights[index], -1)
+        self.contracted_neighbors = [0] * node_count
+        self.rank = array("i", [-1]) * node_count
+
+    def run(self):
+        """
+        Contracts every node and collects the upward edges.
+
+        Returns:
+            ContractionHierarchy: The built hierarchy.
+        """
+        node_count = self.graph.node_count()
+        up_rows = [None] * node_count
+        down_rows = [None] * node_count
+        heap = [(self._priority(node_id), node_id) for node_id in range(node_count)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            priority = self._priority(node_id)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, node_id))
+                continue
+            up_rows[node_id] = self.out_edges[node_id]
+            down_rows[node_id] = self.in_edges[node_id]
+            self._contract(node_id)
+            self.rank[node_id] = order
+            order += 1
+        return ContractionHierarchy(
+            self.graph.names, self.rank, _compile(up_rows), _compile(down_rows)
+        )
+
+    def _add_edge(self, source_id, target_id, weight, middle_id):
+        """
+        Adds an edge to the remaining graph, keeping only the cheapest of
+        parallel edges.
+        """
+        existing = self.out_edges[source_id].get(target_id)
+        if existing is None or weight < existing[0]:
+            self.out_edges[source_id][target_id] = (weight, middle_id)
+            self.in_edges[target_id][source_id] = (weight, middle_id)
+
+    def _priority(self, node_id):
+        """
+        Scores a node for contraction; lower is contracted first.
+        """
+        edge_difference = len(self._shortcuts(node_id, PRIORITY_WITNESS_LIMIT)) - (
+            len(self.in_edges[node_id]) + len(self.out_edges[node_id])
+        )
+        return edge_difference + self.contracted_neighbors[node_id]
+
+    def _contract(self, node_id):
+        """
+        Removes a node from the remaining graph, adding the shortcuts
+        needed to keep every shortest path between its neighbors.
+        """
+        for source_id, target_id, weight in self._shortcuts(
+            node_id, self.witness_limit
+        ):
+            self._add_edge(source_id, target_id, weight, node_id)
+        for source_id in self.in_edges[node_id]:
+            del self.out_edges[source_id][node_id]
+            self.contracted_neighbors[source_id] += 1
+        for target_id in self.out_edges[node_id]:
+            del self.in_edges[target_id][node_id]
+            self.contracted_neighbors[target_id] += 1
+        self.in_edges[node_id] = {}
+        self.out_edges[node_id] = {}
+
+    def _shortcuts(self, node_id, limit):
+        """
+        Finds the shortcuts contracting a node would need: for every
+        in-neighbor u and out-neighbor w, u -> node -> w needs a shortcut
+        unless a witness search from u that avoids node finds a path to w
+        at most as cheap.
+
+        Returns:
+            list: (source id, target id, weight) shortcuts.
+        """
+        shortcuts = []
+        out_edges = self.out_edges[node_id]
+        if not out_edges:
+            return shortcuts
+        for source_id, (in_weight, _) in self.in_edges[node_id].items():
+            targets = {
+                target_id: in_weight + out_weight
+                for target_id, (out_weight, _) in out_edges.items()
+                if target_id != source_id
+            }
+            if not targets:
+                continue
+            witness = self._witness_distances(
+                source_id, node_id, targets, max(targets.values()), limit
+            )
+            for target_id, via_cost in targets.items():
+                if witness.get(target_id, INFINITY) > via_cost:
+                    shortcuts.append((source_id, target_id, via_cost))
+        return shortcuts
+
+    def _witness_distances(self, source_id, avoided_id, targets, max_cost, limit):
+        """
+        Runs a bounded Dijkstra search from source that never enters the
+        avoided node.
+
+        Returns:
+            dict: The best costs found, by node id.
+        """
+        distances = {source_id: 0}
+        heap = [(0, source_id)]
+        remaining = len(targets)
+        settled = 0
+        while heap and remaining and settled < limit:
+            distance, current_id = heapq.heappop(heap)
+            if distance > distances[current_id]:
+                continue
+            settled += 1
+            if current_id in targets:
+                remaining -= 1
+            for next_id, (weight, _) in self.out_edges[current_id].items():
+                if next_id == avoided_id:
+                    continue
+                new_distance = distance + weight
+                if new_distance <= max_cost and new_distance < distances.get(
+                    next_id, INFINITY
+                ):
+                    distances[next_id] = new_distance
+                    heapq.heappush(heap, (new_distance, next_id))
+        return distances
+
+
+def _compile(rows):
+    """
+    Packs per-node {other: (weight, middle)} rows into CSR arrays.
+
+    Returns:
+        tuple: (offsets, others, weights, middles) arrays.
+    """
+    offsets = array("q", [0])
+    others = array("i")
+    weights = array("d")
+    middles = array("i")
+    for row in rows:
+        for other_id, (weight, middle_id) in row.items():
+            others.append(other_id)
+            weights.append(weight)
+            middles.append(middle_id)
+        offsets.append(len(others))
+    return offsets, others, weights, middles
@@ -1,4 +1,7 @@
+from .csr_graph import CSRGraph, GraphBuilder
 from .custom_set import Set
 from .fifo_queue import FIFOQueue
+from .heap_priority_queue import HeapPriorityQueue
 from .lifo_queue import LIFOQueue
 from .priority_queue import PriorityQueue
+from .versioned_time_map import VersionedTimeMap
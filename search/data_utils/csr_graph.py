@@ -0,0 +1,307 @@
+"""
+Utilities module consisting of CSRGraph and GraphBuilder
+"""
+
+from array import array
+
+
+class CSRGraph:
+    """
+    Represents a weighted directed graph in compressed-sparse-row (CSR)
+    layout. Node names are interned to integer ids; the neighbors of node i
+    are neighbors[offsets[i]:offsets[i + 1]] and the matching edge weights
+    are the same slice of weights. Expanding a node costs O(degree) and the
+    graph takes O(V + E) memory.
+
+    Attributes:
+        names: List mapping each node id to its name.
+        ids: Dictionary mapping each node name to its id.
+        offsets: Array of V + 1 row offsets into neighbors and weights.
+        neighbors: Array of neighbor node ids, grouped by source node.
+        weights: Array of edge weights, parallel to neighbors.
+    """
+
+    def __init__(self, names, offsets, neighbors, weights, ids=None):
+        """
+        Initializes a CSRGraph from already compiled arrays.
+
+        Args:
+            names (list): Node names indexed by node id.
+            offsets (array): Row offsets, one more than the number of nodes.
+            neighbors (array): Neighbor node ids.
+            weights (array): Edge weights, parallel to neighbors.
+            ids (dict): Optional name to id mapping; built from names if
+                        not given.
+        """
+        self.names = names
+        if ids is None:
+            ids = {name: node_id for node_id, name in enumerate(names)}
+        self.ids = ids
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self._reverse = None
+
+    @classmethod
+    def from_time_map(cls, time_map):
+        """
+        Compiles a dictionary adjacency map into a CSRGraph. Node ids follow
+        the order of the map's keys and each row keeps the order of its
+        inner dictionary, so searches expand children in the same order as
+        on the map itself. None entries are treated as missing edges.
+
+        Args:
+            time_map (dict): A dictionary containing the similarity map.
+
+        Returns:
+            CSRGraph: The compiled graph.
+        """
+        builder = GraphBuilder()
+        for node in time_map:
+            builder.add_node(node)
+        for node, row in time_map.items():
+            for neighbor, weight in row.items():
+                if weight is not None:
+                    builder.add_edge(node, neighbor, weight)
+        return builder.build()
+
+    @classmethod
+    def from_edges(cls, edges, undirected=False):
+        """
+        Compiles an edge list into a CSRGraph.
+
+        Args:
+            edges (iterable): (source, target, weight) triples.
+            undirected (bool): If True, every edge is also added in the
+                               reverse direction.
+
+        Returns:
+            CSRGraph: The compiled graph.
+        """
+        builder = GraphBuilder()
+        for source, target, weight in edges:
+            builder.add_edge(source, target, weight)
+            if undirected:
+                builder.add_edge(target, source, weight)
+        return builder.build()
+
+    def node_count(self):
+        """
+        Gets the number of nodes in the graph.
+
+        Returns:
+            int: The number of nodes.
+        """
+        return len(self.offsets) - 1
+
+    def edge_count(self):
+        """
+        Gets the number of directed edges in the graph.
+
+        Returns:
+            int: The number of edges.
+        """
+        return len(self.neighbors)
+
+    def id_of(self, name):
+        """
+        Gets the interned id of a node.
+
+        Args:
+            name (str): The node name.
+
+        Returns:
+            int: The node id.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        return self.ids[name]
+
+    def name_of(self, node_id):
+        """
+        Gets the name of an interned node id.
+
+        Args:
+            node_id (int): The node id.
+
+        Returns:
+            str: The node name.
+        """
+        return self.names[node_id]
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return self.node_count()
+
+    def expand(self, node):
+        """
+        Expands the children of a node.
+
+        Args:
+            node (str): The node to expand.
+
+        Returns:
+            list: The names of the node's neighbors.
+        """
+        node_id = self.id_of(node)
+        names = self.names
+        return [
+            names[child_id]
+            for child_id in self.neighbors[
+                self.offsets[node_id] : self.offsets[node_id + 1]
+            ]
+        ]
+
+    def expand_with_costs(self, node):
+        """
+        Expands the children of a node along with the edge weights.
+
+        Args:
+            node (str): The node to expand.
+
+        Returns:
+            list: (neighbor name, edge weight) pairs.
+        """
+        node_id = self.id_of(node)
+        start, stop = self.offsets[node_id], self.offsets[node_id + 1]
+        names = self.names
+        return [
+            (names[child_id], weight)
+            for child_id, weight in zip(
+                self.neighbors[start:stop], self.weights[start:stop]
+            )
+        ]
+
+    def reverse(self):
+        """
+        Gets the graph with every edge reversed, sharing this graph's node
+        ids. The reversed graph is built once and cached, so backward
+        searches can expand predecessors in O(degree).
+
+        Returns:
+            CSRGraph: The reversed graph.
+        """
+        if self._reverse is None:
+            node_count = self.node_count()
+            offsets = array("q", [0]) * (node_count + 1)
+            for target_id in self.neighbors:
+                offsets[target_id + 1] += 1
+            for node_id in range(node_count):
+                offsets[node_id + 1] += offsets[node_id]
+            cursor = array("q", offsets)
+            neighbors = array("i", [0]) * len(self.neighbors)
+            weights = array("d", [0.0]) * len(self.weights)
+            for source_id in range(node_count):
+                for index in range(
+                    self.offsets[source_id], self.offsets[source_id + 1]
+                ):
+                    target_id = self.neighbors[index]
+                    position = cursor[target_id]
+                    neighbors[position] = source_id
+                    weights[position] = self.weights[index]
+                    cursor[target_id] = position + 1
+            self._reverse = CSRGraph(self.names, offsets, neighbors, weights, self.ids)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def weight(self, source, target):
+        """
+        Gets the weight of an edge in O(degree) time.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+
+        Returns:
+            float or None: The edge weight, or None if there is no edge.
+        """
+        source_id = self.id_of(source)
+        target_id = self.ids.get(target)
+        for index in range(self.offsets[source_id], self.offsets[source_id + 1]):
+            if self.neighbors[index] == target_id:
+                return self.weights[index]
+        return None
+
+
+class GraphBuilder:
+    """
+    Incrementally builds a CSRGraph. Names are interned as they are first
+    seen and edges are buffered in flat arrays, so building never holds a
+    dictionary per node.
+
+    Attributes:
+        names: List mapping each node id to its name.
+        ids: Dictionary mapping each node name to its id.
+        sources: Array of edge source ids in insertion order.
+        targets: Array of edge target ids in insertion order.
+        weights: Array of edge weights in insertion order.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.sources = array("i")
+        self.targets = array("i")
+        self.weights = array("d")
+
+    def add_node(self, name):
+        """
+        Interns a node name.
+
+        Args:
+            name (str): The node name.
+
+        Returns:
+            int: The id of the node.
+        """
+        node_id = self.ids.get(name)
+        if node_id is None:
+            node_id = len(self.names)
+            self.ids[name] = node_id
+            self.names.append(name)
+        return node_id
+
+    def add_edge(self, source, target, weight):
+        """
+        Adds a directed edge, interning both endpoints.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+            weight (float): The edge weight.
+        """
+        self.sources.append(self.add_node(source))
+        self.targets.append(self.add_node(target))
+        self.weights.append(weight)
+
+    def build(self):
+        """
+        Compiles the buffered edges into a CSRGraph with a counting sort on
+        the source id. Edges from the same source keep their insertion order.
+
+        Returns:
+            CSRGraph: The compiled graph.
+        """
+        node_count = len(self.names)
+        offsets = array("q", [0]) * (node_count + 1)
+        for source_id in self.sources:
+            offsets[source_id + 1] += 1
+        for node_id in range(node_count):
+            offsets[node_id + 1] += offsets[node_id]
+        cursor = array("q", offsets)
+        neighbors = array("i", [0]) * len(self.targets)
+        weights = array("d", [0.0]) * len(self.weights)
+        for source_id, target_id, weight in zip(
+            self.sources, self.targets, self.weights
+        ):
+            index = cursor[source_id]
+            neighbors[index] = target_id
+            weights[index] = weight
+            cursor[source_id] = index + 1
+        return CSRGraph(self.names, offsets, neighbors, weights, self.ids)
@@ -2,23 +2,24 @@
 Utilities module consisting of FIFOQueue
 """
 
-from .nodes import QueueNode
+from collections import deque
 
 
 class FIFOQueue:
     """
-    Represents a First-In-First-Out (FIFO) Queue using a
-    class-based linked list. Each QueueNode will contain a
-    graph node and the path until that node.
+    Represents a First-In-First-Out (FIFO) Queue backed by a deque. Each
+    entry holds a graph node and the path until that node. A count of the
+    entries per node is kept alongside, so membership tests take O(1) time
+    instead of a walk over the queue.
 
     Attributes:
-        front: Reference to the front (first) node in the queue.
-        rear: Reference to the rear (last) node in the queue.
+        entries: Deque of (data, path) pairs, front first.
+        counts: Dictionary mapping each element to its number of entries.
     """
 
     def __init__(self):
-        self.front = None
-        self.rear = None
+        self.entries = deque()
+        self.counts = {}
 
     def is_empty(self):
         """
@@ -27,7 +28,16 @@ class FIFOQueue:
         Returns:
             bool: True if the queue is empty, False otherwise.
         """
-        return self.front is None
+        return not self.entries
+
+    def size(self):
+        """
+        Gets the number of elements in the queue.
+
+        Returns:
+            int: The number of elements in the queue.
+        """
+        return len(self.entries)
 
     def is_exists(self, data):
         """
@@ -39,12 +49,7 @@ class FIFOQueue:
         Returns:
             bool: True if the element exists in the Queue, False otherwise.
         """
-        current = self.front
-        while current is not None:
-            if current.data == data:
-                return True
-            current = current.get_next()
-        return False
+        return data in self.counts
 
     def enqueue(self, data, path):
         """
@@ -54,12 +59,8 @@ class FIFOQueue:
             data: The data to be enqueued.
             path: The path associated with the data.
         """
-        new_node = QueueNode(data, path)
-        if self.is_empty():
-            self.front = self.rear = new_node
-        else:
-            self.rear.next = new_node
-            self.rear = new_node
+        self.entries.append((data, path))
+        self.counts[data] = self.counts.get(data, 0) + 1
 
     def dequeue(self):
         """
@@ -74,9 +75,10 @@ class FIFOQueue:
         """
         if self.is_empty():
             raise IndexError("Queue is empty")
-        data = self.front.get_data()
-        path = self.front.get_path()
-        self.front = self.front.get_next()
-        if self.front is None:
-            self.rear = None
+        data, path = self.entries.popleft()
+        count = self.counts[data]
+        if count == 1:
+            del self.counts[data]
+        else:
+            self.counts[data] = count - 1
         return data, path
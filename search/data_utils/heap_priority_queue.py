@@ -0,0 +1,233 @@
+"""
+Utilities module consisting of HeapPriorityQueue
+"""
+
+
+class HeapPriorityQueue:
+    """
+    Represents a Priority Queue using an array-backed binary min-heap with a
+    position index. Elements are ordered on (priority, tie-breaking priority)
+    and then on insertion order, which is the same order the linked-list
+    PriorityQueue produces. The position index gives O(1) membership tests
+    and lets an existing element be re-prioritised in place (decrease-key)
+    in O(log n).
+
+    Attributes:
+        heap: List of entries [key, data, path] kept in heap order, where key
+              is (priority, tiebreaking_priority, sequence).
+        position: Dictionary mapping each element to its index in the heap.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty HeapPriorityQueue.
+        """
+        self.heap = []
+        self.position = {}
+        self._sequence = 0
+
+    def is_empty(self):
+        """
+        Checks if the queue is empty.
+
+        Returns:
+            bool: True if the queue is empty, False otherwise.
+        """
+        return not self.heap
+
+    def size(self):
+        """
+        Gets the number of elements in the queue.
+
+        Returns:
+            int: The number of elements in the queue.
+        """
+        return len(self.heap)
+
+    def is_exists(self, data):
+        """
+        Checks if a given element exists in the Queue.
+
+        Args:
+            data: The element to check for existence in the Queue.
+
+        Returns:
+            bool: True if the element exists in the Queue, False otherwise.
+        """
+        return data in self.position
+
+    def get_priority(self, data):
+        """
+        Gets the priority and tie-breaking priority of an element.
+
+        Args:
+            data: The element to look up.
+
+        Returns:
+            tuple: The (priority, tiebreaking_priority) of the element.
+
+        Raises:
+            KeyError: If the element is not in the queue.
+        """
+        key = self.heap[self.position[data]][0]
+        return key[0], key[1]
+
+    def peek_priority(self):
+        """
+        Gets the priority and tie-breaking priority of the front element
+        without removing it.
+
+        Returns:
+            tuple: The (priority, tiebreaking_priority) of the front element.
+
+        Raises:
+            IndexError: If the queue is empty.
+        """
+        if self.is_empty():
+            raise IndexError("Queue is empty")
+        key = self.heap[0][0]
+        return key[0], key[1]
+
+    def enqueue(self, data, path, priority, tiebreaking_priority=None):
+        """
+        Enqueues (adds) an element to the queue and places it based on
+        its priority and tie-breaking priority. If the element exists, its
+        path is updated; if its priorities also change it is moved to its
+        new place, as if it had just been inserted, and otherwise it keeps
+        its place among its ties, like in the linked-list PriorityQueue.
+
+        Args:
+            data: The data to be enqueued.
+            path: Path until the node.
+            priority: The priority associated with this data.
+            tiebreaking_priority: Tie-breaking priority associated. None is
+                                  ordered as 0.
+        """
+        if tiebreaking_priority is None:
+            tiebreaking_priority = 0
+        index = self.position.get(data)
+        if index is not None:
+            entry = self.heap[index]
+            entry[2] = path
+            old_key = entry[0]
+            if (priority, tiebreaking_priority) == old_key[:2]:
+                return
+        self._sequence += 1
+        key = (priority, tiebreaking_priority, self._sequence)
+        if index is None:
+            self.heap.append([key, data, path])
+            index = len(self.heap) - 1
+            self.position[data] = index
+            self._sift_up(index)
+            return
+        entry[0] = key
+        if key < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def dequeue(self):
+        """
+        Dequeues (removes and returns) the element with the lowest priority.
+
+        Returns:
+            data: The data dequeued from the front of the queue.
+            path: The path associated with this data.
+
+        Raises:
+            IndexError: If the queue is empty when dequeue is called.
+        """
+        if self.is_empty():
+            raise IndexError("Queue is empty")
+        return self._pop(0)
+
+    def remove(self, data):
+        """
+        Removes an element from anywhere in the queue.
+
+        Args:
+            data: The element to remove.
+
+        Returns:
+            path: The path associated with the removed element.
+
+        Raises:
+            KeyError: If the element is not in the queue.
+        """
+        return self._pop(self.position[data])[1]
+
+    def _pop(self, index):
+        """
+        Removes the entry at a heap index and restores the heap order.
+
+        Args:
+            index: Index of the entry in the heap.
+
+        Returns:
+            data: The data of the removed entry.
+            path: The path of the removed entry.
+        """
+        heap = self.heap
+        entry = heap[index]
+        last = heap.pop()
+        del self.position[entry[1]]
+        if index < len(heap):
+            heap[index] = last
+            self.position[last[1]] = index
+            if last[0] < entry[0]:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+        return entry[1], entry[2]
+
+    def _sift_up(self, index):
+        """
+        Moves the entry at index towards the root until its parent is
+        not greater than it.
+
+        Args:
+            index: Index of the entry in the heap.
+        """
+        heap = self.heap
+        position = self.position
+        entry = heap[index]
+        key = entry[0]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if parent[0] <= key:
+                break
+            heap[index] = parent
+            position[parent[1]] = index
+            index = parent_index
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def _sift_down(self, index):
+        """
+        Moves the entry at index towards the leaves until neither child is
+        smaller than it.
+
+        Args:
+            index: Index of the entry in the heap.
+        """
+        heap = self.heap
+        position = self.position
+        size = len(heap)
+        entry = heap[index]
+        key = entry[0]
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            right_index = child_index + 1
+            if right_index < size and heap[right_index][0] < heap[child_index][0]:
+                child_index = right_index
+            child = heap[child_index]
+            if key <= child[0]:
+                break
+            heap[index] = child
+            position[child[1]] = index
+            index = child_index
+        heap[index] = entry
+        position[entry[1]] = index
@@ -2,21 +2,22 @@
 Utilities module consisting of LIFOQueue
 """
 
-from .nodes import QueueNode
-
 
 class LIFOQueue:
     """
-    Represents a stack implemented using a class-based linked list. This is
-    a Last-In-First-Out (LIFO) queue. Each QueueNode will contain a graph
-    node and the path until that node.
+    Represents a stack backed by a list. This is a Last-In-First-Out (LIFO)
+    queue. Each entry holds a graph node and the path until that node. A
+    count of the entries per node is kept alongside, so membership tests
+    take O(1) time instead of a walk over the stack.
 
     Attributes:
-        top: A reference to the top element in the stack.
+        entries: List of (data, path) pairs, top last.
+        counts: Dictionary mapping each element to its number of entries.
     """
 
     def __init__(self):
-        self.top = None
+        self.entries = []
+        self.counts = {}
 
     def is_empty(self):
         """
@@ -25,7 +26,16 @@ class LIFOQueue:
         Returns:
             bool: True if the stack is empty, False otherwise.
         """
-        return self.top is None
+        return not self.entries
+
+    def size(self):
+        """
+        Gets the number of elements in the stack.
+
+        Returns:
+            int: The number of elements in the stack.
+        """
+        return len(self.entries)
 
     def push(self, data, path):
         """
@@ -35,9 +45,8 @@ class LIFOQueue:
             data: The data to be pushed onto the stack.
             path: The path associated with the data.
         """
-        new_node = QueueNode(data, path)
-        new_node.next = self.top
-        self.top = new_node
+        self.entries.append((data, path))
+        self.counts[data] = self.counts.get(data, 0) + 1
 
     def pop(self):
         """
@@ -51,9 +60,12 @@ class LIFOQueue:
             IndexError: If the stack is empty when pop is called.
         """
         if not self.is_empty():
-            data = self.top.get_data()
-            path = self.top.get_path()
-            self.top = self.top.get_next()
+            data, path = self.entries.pop()
+            count = self.counts[data]
+            if count == 1:
+                del self.counts[data]
+            else:
+                self.counts[data] = count - 1
             return data, path
         raise IndexError("Stack is empty")
 
@@ -67,9 +79,4 @@ class LIFOQueue:
         Returns:
             bool: True if the element exists in the Stack, False otherwise.
         """
-        current = self.top
-        while current is not None:
-            if current.data == data:
-                return True
-            current = current.next
-        return False
+        return data in self.counts
@@ -0,0 +1,99 @@
+"""
+Utilities module consisting of VersionedTimeMap
+"""
+
+
+class VersionedTimeMap(dict):
+    """
+    Represents a time_map dictionary that stamps every edge change with a
+    new version and tells its listeners about it. It can be passed to any
+    search in place of a plain time_map. Edges must be changed through
+    set_edge and remove_edge; editing the inner dictionaries directly is
+    not tracked.
+
+    Attributes:
+        version: Number of edge changes made so far.
+        listeners: Callables of (source, target) called after each change.
+    """
+
+    def __init__(self, time_map=None):
+        """
+        Initializes a VersionedTimeMap, copying the rows of a time_map.
+
+        Args:
+            time_map (dict): Optional dictionary containing the similarity
+                             map to start from.
+        """
+        super().__init__()
+        if time_map is not None:
+            for node, row in time_map.items():
+                self[node] = dict(row)
+        self.version = 0
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """
+        Registers a callable of (source, target) to call after each change.
+
+        Args:
+            listener (callable): The listener.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregisters a listener.
+
+        Args:
+            listener (callable): The listener.
+
+        Raises:
+            ValueError: If the listener is not registered.
+        """
+        self.listeners.remove(listener)
+
+    def set_edge(self, source, target, weight):
+        """
+        Adds or reweights an edge, adding its nodes if they are new. Setting
+        an edge to the weight it already has is not a change.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+            weight (float): The edge weight, or None to remove the edge.
+        """
+        if weight is None:
+            self.remove_edge(source, target)
+            return
+        row = self.setdefault(source, {})
+        self.setdefault(target, {})
+        if row.get(target) == weight:
+            return
+        row[target] = weight
+        self._changed(source, target)
+
+    def remove_edge(self, source, target):
+        """
+        Removes an edge. Removing a missing edge is not a change.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+        """
+        row = self.get(source)
+        if row is None or row.get(target) is None:
+            return
+        del row[target]
+        self._changed(source, target)
+
+    def _changed(self, source, target):
+        """
+        Bumps the version and notifies the listeners of a changed edge.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+        """
+        self.version += 1
+        for listener in list(self.listeners):
+            listener(source, target)
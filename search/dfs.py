@@ -1,32 +1,204 @@
 """
-Implementation of DFS.
+Implementation of DFS, graph-search DFS and iterative deepening.
 """
 
-from data_utils import LIFOQueue
+from data_utils import CSRGraph, LIFOQueue
 from expand import expand
+from reconstruct import unwind_path
 
 
-def depth_first_search(time_map, start, end):
+def depth_first_search(time_map, start, end, stats=None, reachability=None):
     """
     Performs Depth-First Search (DFS) algorithm to find the path
-    from start to end.
+    from start to end. Each stack entry holds a (node, parent_link) pair
+    instead of a copy of its path; the path is rebuilt once the goal is
+    reached. A node may be pushed again after it is popped, so parents are
+    kept per entry rather than per node.
 
     Args:
-        time_map (dict): A dictionary containing the similarity map.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
         start (str): The starting node.
         end (str): The goal node.
+        stats (SearchStats): Optional statistics to record into.
+        reachability (ReachabilityIndex): Optional index to answer pairs in
+                                          different components at once.
 
     Returns:
         list or None: The path from start to end, or None if no path is found.
     """
+    if stats is not None:
+        stats.start()
+    if reachability is not None and not reachability.connected(start, end):
+        if stats is not None:
+            stats.stop()
+        return None
     frontier = LIFOQueue()
-    frontier.push(start, [start])
+    frontier.push(start, (start, None))
+    if stats is not None:
+        stats.enqueue(start, 1)
     while not frontier.is_empty():
-        current_node, path = frontier.pop()
+        current_node, link = frontier.pop()
         if current_node == end:
-            return path
+            if stats is not None:
+                stats.stop()
+            return unwind_path(link)
+        if stats is not None:
+            stats.expand(current_node)
         for child_node in expand(current_node, time_map):
             if not frontier.is_exists(child_node):
-                new_path = path + [child_node]
-                frontier.push(child_node, new_path)
+                frontier.push(child_node, (child_node, link))
+                if stats is not None:
+                    stats.enqueue(child_node, frontier.size())
+            elif stats is not None:
+                stats.duplicate(child_node)
+    if stats is not None:
+        stats.stop()
+    return None
+
+
+def graph_depth_first_search(time_map, start, end, stats=None):
+    """
+    Performs Depth-First Search that never expands a node twice. Expanded
+    nodes are marked in a visited bitmap over interned node ids, one bit
+    per node (a CSRGraph's own ids, or ids given out on expansion for a
+    dictionary), and are neither pushed nor expanded again, so the search
+    takes O(V + E) time even on cyclic graphs where depth_first_search can
+    revisit nodes over and over. Children are pushed and popped in the same
+    order as depth_first_search, which returns the same path whenever it
+    reaches the goal without coming back to a node it already expanded.
+
+    Args:
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        stats (SearchStats): Optional statistics to record into.
+
+    Returns:
+        list or None: The path from start to end, or None if no path is found.
+    """
+    if stats is not None:
+        stats.start()
+    if isinstance(time_map, CSRGraph):
+        ids = time_map.ids
+        visited = bytearray((len(ids) + 7) >> 3)
+    else:
+        # ids are handed out as nodes are expanded, so a query costs nothing
+        # per node it never reaches and targets without a row need no id
+        ids = {}
+        visited = bytearray()
+    frontier = LIFOQueue()
+    frontier.push(start, (start, None))
+    if stats is not None:
+        stats.enqueue(start, 1)
+    while not frontier.is_empty():
+        current_node, link = frontier.pop()
+        if current_node == end:
+            if stats is not None:
+                stats.stop()
+            return unwind_path(link)
+        children = expand(current_node, time_map)
+        node_id = ids.get(current_node)
+        if node_id is None:
+            node_id = ids[current_node] = len(ids)
+            if node_id >> 3 == len(visited):
+                visited.append(0)
+        visited[node_id >> 3] |= 1 << (node_id & 7)
+        if stats is not None:
+            stats.expand(current_node)
+        for child_node in children:
+            child_id = ids.get(child_node)
+            if frontier.is_exists(child_node) or (
+                child_id is not None and visited[child_id >> 3] & (1 << (child_id & 7))
+            ):
+                if stats is not None:
+                    stats.duplicate(child_node)
+                continue
+            frontier.push(child_node, (child_node, link))
+            if stats is not None:
+                stats.enqueue(child_node, frontier.size())
+    if stats is not None:
+        stats.stop()
+    return None
+
+
+def iterative_deepening_search(time_map, start, end, max_depth=None, stats=None):
+    """
+    Performs Iterative-Deepening Depth-First Search: depth-limited DFS with
+    a limit of 0, 1, 2, ... hops until the goal is found. It finds a path
+    with the fewest hops, like breadth_first_search, while holding only
+    the current path and one child iterator per level, so its memory is
+    O(depth) instead of O(V). Nodes already on the current path are
+    skipped, and children are tried in the order depth_first_search pops
+    them.
+
+    Args:
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        max_depth (int): Optional largest number of hops to try; by default
+                         the search deepens until no path of the current
+                         length is cut off.
+        stats (SearchStats): Optional statistics to record into.
+
+    Returns:
+        list or None: A path from start to end with the fewest hops, or None
+                      if no path is found within max_depth hops.
+    """
+    if stats is not None:
+        stats.start()
+    depth_limit = 0
+    while max_depth is None or depth_limit <= max_depth:
+        path, cut_off = _depth_limited_search(time_map, start, end, depth_limit, stats)
+        if path is not None or not cut_off:
+            if stats is not None:
+                stats.stop()
+            return path
+        depth_limit += 1
+    if stats is not None:
+        stats.stop()
     return None
+
+
+def _depth_limited_search(time_map, start, end, depth_limit, stats):
+    """
+    Searches every path of at most depth_limit hops from start.
+
+    Returns:
+        tuple: The path to end or None, and whether any path was cut off
+               at the depth limit.
+    """
+    if start == end:
+        return [start], False
+    if depth_limit == 0:
+        return None, True
+    path = [start]
+    on_path = {start}
+    children = [iter(reversed(expand(start, time_map)))]
+    cut_off = False
+    if stats is not None:
+        stats.expand(start)
+    while children:
+        child_node = next(children[-1], None)
+        if child_node is None:
+            children.pop()
+            on_path.discard(path.pop())
+            continue
+        if child_node in on_path:
+            if stats is not None:
+                stats.duplicate(child_node)
+            continue
+        if child_node == end:
+            return path + [end], cut_off
+        if len(path) == depth_limit:
+            cut_off = True
+            continue
+        path.append(child_node)
+        on_path.add(child_node)
+        children.append(iter(reversed(expand(child_node, time_map))))
+        if stats is not None:
+            stats.expand(child_node)
+            stats.enqueue(child_node, len(path))
+    return None, cut_off
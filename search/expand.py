@@ -9,9 +9,53 @@ def expand(node, _map):
 
     Args:
         node (str): The current node to expand.
-        _map (dict): A dictionary representing the adjacency map of the tree.
+        _map (dict or CSRGraph): A dictionary representing the adjacency map
+                                 of the tree, or a compiled CSRGraph.
 
     Returns:
         list: A list of child nodes that are not None in the adjacency map.
     """
-    return [next for next in _map[node] if _map[node][next] is not None]
+    if isinstance(_map, dict):
+        return [next for next in _map[node] if _map[node][next] is not None]
+    return _map.expand(node)
+
+
+def expand_with_costs(node, _map):
+    """
+    Expands child nodes of a parent node along with the edge costs.
+
+    Args:
+        node (str): The current node to expand.
+        _map (dict or CSRGraph): A dictionary representing the adjacency map
+                                 of the tree, or a compiled CSRGraph.
+
+    Returns:
+        list: A list of (child node, cost) pairs for the edges that are not
+              None in the adjacency map.
+    """
+    if isinstance(_map, dict):
+        return [(next, cost) for next, cost in _map[node].items() if cost is not None]
+    return _map.expand_with_costs(node)
+
+
+def expand_predecessors(node, _map):
+    """
+    Expands the parent nodes of a node, i.e. the nodes with an edge into it,
+    along with the edge costs. Used by searches that run backwards from
+    the goal. On a dictionary this scans every row of the map; a CSRGraph
+    answers from its cached reversed graph.
+
+    Args:
+        node (str): The current node to expand.
+        _map (dict or CSRGraph): A dictionary representing the adjacency map
+                                 of the tree, or a compiled CSRGraph.
+
+    Returns:
+        list: A list of (parent node, cost) pairs for the edges into node
+              that are not None in the adjacency map.
+    """
+    if isinstance(_map, dict):
+        return [
+            (prev, row[node]) for prev, row in _map.items() if row.get(node) is not None
+        ]
+    return _map.reverse().expand_with_costs(node)
@@ -0,0 +1,352 @@
+"""
+Defines a compact binary graph file format and a memory-mapped loader.
+
+A graph file holds, in order and each section padded to 8 bytes:
+
+    header        magic, version, flags, node count, edge count and the
+                  byte length of the name blob (HEADER below)
+    name offsets  uint64[V + 1] byte offsets of each name in the name blob
+    name blob     UTF-8 node names, sorted, so node id = rank of the name
+    row offsets   int64[V + 1] CSR offsets into neighbors and weights
+    neighbors     int32[E] neighbor node ids
+    weights       float64[E] edge weights
+    heuristic     uint16[V * V] estimate from row node to column node,
+                  present only if the HAS_HEURISTIC flag is set
+
+All numbers are little-endian. Each row keeps the neighbor order of the
+map it was written from, so searches expand children in the same order
+and return the same paths. Loading maps the file and reads every section
+in place: names are decoded on demand and looked up by binary search, so
+no per-node Python objects are built.
+"""
+
+import mmap
+import operator
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+from data_utils import CSRGraph
+from heuristics import heuristic
+
+MAGIC = b"SRCHGRPH"
+VERSION = 1
+HAS_HEURISTIC = 1
+# magic, version, flags, node count, edge count, name blob length
+HEADER = struct.Struct("<8sIIQQQ")
+# largest estimate the heuristic section can hold
+MAX_ESTIMATE = 0xFFFF
+
+
+def write_graph(filename, time_map, dis_map=None):
+    """
+    Writes a graph, and optionally its heuristic, to a graph file.
+
+    Args:
+        filename (str): The file to write.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        dis_map (dict or Landmarks): Optional distance map, or any object
+                                     with an estimate(node, goal) method,
+                                     stored as a V x V table. Estimates are
+                                     rounded down and capped at MAX_ESTIMATE
+                                     so they stay admissible.
+    """
+    if isinstance(time_map, dict):
+        time_map = CSRGraph.from_time_map(time_map)
+    node_count = time_map.node_count()
+    names = sorted(time_map.names, key=lambda name: name.encode("utf-8"))
+    new_ids = array("i", [0]) * node_count
+    for new_id, name in enumerate(names):
+        new_ids[time_map.id_of(name)] = new_id
+
+    encoded = [name.encode("utf-8") for name in names]
+    name_offsets = array("Q", [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    offsets = array("q", [0])
+    neighbors = array("i")
+    weights = array("d")
+    for name in names:
+        old_id = time_map.id_of(name)
+        start, stop = time_map.offsets[old_id], time_map.offsets[old_id + 1]
+        neighbors.extend(
+            new_ids[child_id] for child_id in time_map.neighbors[start:stop]
+        )
+        weights.extend(time_map.weights[start:stop])
+        offsets.append(len(neighbors))
+
+    flags = 0
+    table = None
+    if dis_map is not None:
+        flags |= HAS_HEURISTIC
+        estimate = heuristic(dis_map)
+        table = array("H")
+        for node in names:
+            for goal in names:
+                table.append(_to_table_value(_safe_estimate(estimate, node, goal)))
+
+    with open(filename, "wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC, VERSION, flags, node_count, len(neighbors), name_offsets[-1]
+            )
+        )
+        _write_section(file, name_offsets)
+        _write_section(file, b"".join(encoded))
+        _write_section(file, offsets)
+        _write_section(file, neighbors)
+        _write_section(file, weights)
+        if table is not None:
+            _write_section(file, table)
+
+
+def load_graph(filename):
+    """
+    Memory-maps a graph file. Loading only reads the header, so it takes
+    milliseconds whatever the size of the graph.
+
+    Args:
+        filename (str): The file to read.
+
+    Returns:
+        MappedGraph: The graph. Its heuristic attribute holds a
+                     MappedHeuristic if the file has one, else None.
+
+    Raises:
+        ValueError: If the file is not a graph file of a known version.
+    """
+    with open(filename, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return MappedGraph(mapped, filename)
+
+
+class MappedGraph(CSRGraph):
+    """
+    Represents a CSRGraph whose arrays live in a memory-mapped graph file.
+    It can be passed anywhere a CSRGraph is accepted. Pickling it only
+    records the file name, and unpickling maps the file again, so worker
+    processes share the file's pages instead of receiving a copy.
+
+    Attributes:
+        filename: The mapped file's name, or None if not known.
+        heuristic: The MappedHeuristic stored in the file, or None.
+    """
+
+    def __init__(self, mapped, filename=None):
+        """
+        Initializes a MappedGraph over a mapped graph file.
+
+        Args:
+            mapped (mmap): The mapped file.
+            filename (str): Optional name of the file, needed to pickle the
+                            graph.
+
+        Raises:
+            ValueError: If the file is not a graph file of a known version.
+        """
+        if len(mapped) < HEADER.size:
+            raise ValueError("Not a graph file")
+        magic, version, flags, node_count, edge_count, blob_size = HEADER.unpack_from(
+            mapped
+        )
+        if magic != MAGIC:
+            raise ValueError("Not a graph file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported graph file version: {version}")
+        self.filename = filename
+        self._mapped = mapped
+        view = memoryview(mapped)
+        self._views = [view]
+        position = _aligned(HEADER.size)
+        name_offsets, position = self._section(view, position, "Q", node_count + 1)
+        blob_view = view[position : position + blob_size]
+        self._views.append(blob_view)
+        position = _aligned(position + blob_size)
+        offsets, position = self._section(view, position, "q", node_count + 1)
+        neighbors, position = self._section(view, position, "i", edge_count)
+        weights, position = self._section(view, position, "d", edge_count)
+        names = _NameTable(name_offsets, blob_view)
+        super().__init__(names, offsets, neighbors, weights, _NameIndex(names))
+        self.heuristic = None
+        if flags & HAS_HEURISTIC:
+            table, position = self._section(
+                view, position, "H", node_count * node_count
+            )
+            self.heuristic = MappedHeuristic(self, table)
+
+    def __reduce__(self):
+        if self.filename is None:
+            raise TypeError("Cannot pickle a MappedGraph without a filename")
+        return load_graph, (self.filename,)
+
+    def close(self):
+        """
+        Unmaps the file. The graph can no longer be used afterwards.
+        """
+        self._reverse = None
+        for view in reversed(self._views):
+            view.release()
+        self._mapped.close()
+
+    def _section(self, view, position, typecode, count):
+        """
+        Reads an array section in place.
+
+        Args:
+            view (memoryview): The view of the whole file.
+            position (int): The byte position of the section.
+            typecode (str): The array typecode of its items.
+            count (int): The number of items.
+
+        Returns:
+            tuple: The section, as a typed memoryview (or an array copy on
+                   big-endian machines), and the position after it.
+        """
+        size = array(typecode).itemsize * count
+        raw = view[position : position + size]
+        if sys.byteorder == "little":
+            section = raw.cast(typecode)
+            self._views.extend((raw, section))
+        else:
+            section = array(typecode, raw.tobytes())
+            section.byteswap()
+            raw.release()
+        return section, _aligned(position + size)
+
+
+class MappedHeuristic:
+    """
+    Represents the V x V heuristic table of a graph file. It can be passed
+    to a_star_search in place of dis_map. It pickles as its graph, and is
+    taken from the graph again when unpickled.
+
+    Attributes:
+        graph: The MappedGraph the table belongs to.
+        table: The uint16 estimates, row-major by node id.
+    """
+
+    def __init__(self, graph, table):
+        self.graph = graph
+        self.table = table
+
+    def __reduce__(self):
+        return operator.attrgetter("heuristic"), (self.graph,)
+
+    def estimate(self, node, goal):
+        """
+        Estimates the cost from node to goal.
+
+        Args:
+            node (str): The node to estimate from.
+            goal (str): The goal node.
+
+        Returns:
+            int: The stored estimate.
+        """
+        ids = self.graph.ids
+        return self.table[ids[node] * self.graph.node_count() + ids[goal]]
+
+
+class _NameTable(Sequence):
+    """
+    A read-only sequence of the node names in a mapped name blob.
+    """
+
+    def __init__(self, name_offsets, blob):
+        self.name_offsets = name_offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    def __getitem__(self, node_id):
+        if not 0 <= node_id < len(self):
+            raise IndexError("Node id out of range")
+        return self.encoded(node_id).decode("utf-8")
+
+    def encoded(self, node_id):
+        """
+        Gets the UTF-8 bytes of a name without decoding it.
+        """
+        return bytes(
+            self.blob[self.name_offsets[node_id] : self.name_offsets[node_id + 1]]
+        )
+
+
+class _NameIndex:
+    """
+    A read-only name to id mapping that binary-searches the sorted names.
+    """
+
+    def __init__(self, names):
+        self.names = names
+
+    def get(self, name, default=None):
+        encoded = name.encode("utf-8")
+        low, high = 0, len(self.names)
+        while low < high:
+            middle = (low + high) // 2
+            if self.names.encoded(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.names) and self.names.encoded(low) == encoded:
+            return low
+        return default
+
+    def __getitem__(self, name):
+        node_id = self.get(name)
+        if node_id is None:
+            raise KeyError(name)
+        return node_id
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _safe_estimate(estimate, node, goal):
+    """
+    Reads one estimate, treating a missing entry as 0.
+    """
+    try:
+        value = estimate(node, goal)
+    except KeyError:
+        return 0
+    return 0 if value is None else value
+
+
+def _to_table_value(value):
+    """
+    Rounds an estimate down into the range of the heuristic table. An
+    infinite estimate, as for an unreachable pair, is stored as MAX_ESTIMATE.
+    """
+    if value != value or value < 0:
+        return 0
+    if value == float("inf"):
+        return MAX_ESTIMATE
+    return min(int(value), MAX_ESTIMATE)
+
+
+def _aligned(position):
+    """
+    Rounds a byte position up to the next multiple of 8.
+    """
+    return (position + 7) & ~7
+
+
+def _write_section(file, data):
+    """
+    Writes an array or bytes section in little-endian order, padded to 8
+    bytes.
+    """
+    if isinstance(data, array) and sys.byteorder != "little":
+        data = array(data.typecode, data)
+        data.byteswap()
+    raw = data.tobytes() if isinstance(data, array) else data
+    file.write(raw)
+    file.write(b"\0" * (_aligned(len(raw)) - len(raw)))
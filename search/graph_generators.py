@@ -0,0 +1,151 @@
+"""
+Defines reproducible synthetic social-graph generators.
+"""
+
+import random
+
+from data_utils import GraphBuilder
+from expand import expand
+
+INFINITY = float("inf")
+# largest graph the benchmark builds a full V x V HopTable for by default;
+# larger graphs use landmarks
+DENSE_DIS_MAP_LIMIT = 2000
+
+
+def scale_free_graph(nodes, edges_per_node=3, seed=0, max_time=30):
+    """
+    Generates a connected undirected scale-free graph with the
+    Barabasi-Albert model: every new person befriends edges_per_node
+    existing people, picked with probability proportional to how many
+    friends they already have, which grows a few heavily connected hubs.
+
+    Args:
+        nodes (int): The number of people.
+        edges_per_node (int): The friendships each new person makes.
+        seed (int): The random seed; the same seed gives the same graph.
+        max_time (int): Edge times are drawn uniformly from 1 to max_time.
+
+    Returns:
+        CSRGraph: The generated graph.
+    """
+    rng = random.Random(seed)
+    names = _names(nodes)
+    builder = GraphBuilder()
+    for name in names:
+        builder.add_node(name)
+    # every node appears here once per friendship it has
+    endpoints = []
+    targets = list(range(min(edges_per_node, nodes)))
+    for node in range(len(targets), nodes):
+        for target in targets:
+            _add_friendship(builder, names[node], names[target], rng, max_time)
+        endpoints.extend(targets)
+        endpoints.extend([node] * len(targets))
+        chosen = set()
+        while len(chosen) < min(edges_per_node, node + 1):
+            chosen.add(rng.choice(endpoints))
+        targets = sorted(chosen)
+    return builder.build()
+
+
+def small_world_graph(nodes, degree=6, rewire=0.05, seed=0, max_time=30):
+    """
+    Generates a connected undirected small-world graph with the
+    Watts-Strogatz model: a ring where every person knows their degree
+    nearest neighbors, with each link except the ring itself rewired to a
+    random person with probability rewire.
+
+    Args:
+        nodes (int): The number of people.
+        degree (int): The even number of ring neighbors per person.
+        rewire (float): The probability of rewiring each link.
+        seed (int): The random seed; the same seed gives the same graph.
+        max_time (int): Edge times are drawn uniformly from 1 to max_time.
+
+    Returns:
+        CSRGraph: The generated graph.
+    """
+    rng = random.Random(seed)
+    names = _names(nodes)
+    builder = GraphBuilder()
+    for name in names:
+        builder.add_node(name)
+    for index in range(nodes):
+        _add_friendship(
+            builder, names[index], names[(index + 1) % nodes], rng, max_time
+        )
+        for offset in range(2, degree // 2 + 1):
+            target = (index + offset) % nodes
+            if rng.random() < rewire:
+                target = rng.randrange(nodes)
+            if target != index:
+                _add_friendship(builder, names[index], names[target], rng, max_time)
+    return builder.build()
+
+
+# the generators the benchmarks build graphs with, by model name
+MODELS = {"scale_free": scale_free_graph, "small_world": small_world_graph}
+
+
+def to_time_map(graph):
+    """
+    Converts a graph to a time_map dictionary. Only existing edges are
+    stored, so the map takes O(V + E) memory instead of the O(V^2) of the
+    dense maps in tests.py; every search treats both the same way.
+
+    Args:
+        graph (CSRGraph): The graph.
+
+    Returns:
+        dict: The time_map.
+    """
+    return {node: dict(graph.expand_with_costs(node)) for node in graph}
+
+
+def hop_dis_map(graph):
+    """
+    Builds the full dis_map of hop counts between every pair of people with
+    one BFS per person. Unreachable pairs are infinitely far, so A* can look
+    up any pair on a disconnected graph. Takes O(V^2) time and memory, so
+    it is only practical for small graphs; HopTable stores the same counts
+    more compactly.
+
+    Args:
+        graph (CSRGraph or dict): The graph.
+
+    Returns:
+        dict: The dis_map, dis_map[node][goal] being the fewest hops.
+    """
+    dis_map = {}
+    for source in graph:
+        hops = {source: 0}
+        level = [source]
+        while level:
+            next_level = []
+            for node in level:
+                for child in expand(node, graph):
+                    if child not in hops:
+                        hops[child] = hops[node] + 1
+                        next_level.append(child)
+            level = next_level
+        for node in graph:
+            hops.setdefault(node, INFINITY)
+        dis_map[source] = hops
+    return dis_map
+
+
+def _names(nodes):
+    """
+    Gets the names of generated people.
+    """
+    return ["Person_{}".format(index) for index in range(nodes)]
+
+
+def _add_friendship(builder, person, other, rng, max_time):
+    """
+    Adds an undirected edge with a random time.
+    """
+    time = rng.randint(1, max_time)
+    builder.add_edge(person, other, time)
+    builder.add_edge(other, person, time)
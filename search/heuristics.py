@@ -0,0 +1,22 @@
+"""
+Defines how searches read heuristic estimates from a dis_map.
+"""
+
+
+def heuristic(dis_map):
+    """
+    Gets an estimate function for a distance map. A dictionary is read as
+    dis_map[node][goal]; any other object, such as Landmarks, is asked for
+    dis_map.estimate(node, goal).
+
+    Args:
+        dis_map (dict or object): A dictionary containing the distance (hops)
+                                  map, or an object with an estimate method.
+
+    Returns:
+        callable: A function of (node, goal) returning the estimated cost
+                  from node to goal.
+    """
+    if isinstance(dis_map, dict):
+        return lambda node, goal: dis_map[node][goal]
+    return dis_map.estimate
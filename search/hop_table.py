@@ -0,0 +1,239 @@
+"""
+Implementation of an all-pairs hop-count table usable as a dis_map.
+"""
+
+import multiprocessing
+import pickle
+import sys
+from array import array
+
+from data_utils import CSRGraph
+
+INFINITY = float("inf")
+# goals searched together in one block, one bit each
+DEFAULT_BLOCK_SIZE = 4096
+TYPECODES = {1: "B", 2: "H"}
+# maps the ASCII digits of format(mask, "b") to the byte values 0 and 1
+_BIT_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+
+# the reversed (offsets, neighbors) arrays each worker process searches
+_worker_graph = None
+
+
+class HopTable:
+    """
+    Represents the fewest hops between every pair of nodes as one flat
+    matrix of unsigned 8-bit integers, or 16-bit ones if some pair is more
+    than 254 hops apart. Row i holds the hops from node i to every node and
+    names are mapped to rows with a dictionary, so a lookup is O(1) and the
+    table takes V^2 bytes instead of the nested dictionaries of a dis_map.
+    A HopTable can be passed to a_star_search in place of dis_map.
+
+    Attributes:
+        names: Node names indexed by row.
+        ids: Dictionary mapping each node name to its row.
+        hops: Array of V^2 hop counts, hops[i * V + j] being the fewest hops
+              from node i to node j.
+        unreachable: The value stored for pairs with no path, the largest
+                     value of the array's type.
+    """
+
+    def __init__(self, names, hops):
+        """
+        Initializes a HopTable from an already built matrix. Use build() or
+        load() to create one.
+
+        Args:
+            names (list): Node names indexed by row.
+            hops (array): The flat hop matrix.
+        """
+        self.names = names
+        self.ids = {name: node_id for node_id, name in enumerate(names)}
+        self.hops = hops
+        self.unreachable = (1 << (8 * hops.itemsize)) - 1
+
+    @classmethod
+    def build(cls, time_map, workers=1, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Computes the hops between every pair of nodes. The search runs
+        backwards from a block of goals at once: every node holds a Python
+        integer with one bit per goal of the block, and each level ORs the
+        frontier's bits into its predecessors, so one pass over the edges
+        advances the searches of all block_size goals. The hop counts of a
+        block are spread from bits into bytes and written a row at a time
+        with integer arithmetic rather than one entry at a time. Blocks are
+        independent and can run on a pool of worker processes.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            workers (int): The number of worker processes; 1 runs the blocks
+                           in this process.
+            block_size (int): The number of goals searched at once. Memory
+                              grows with V times block_size.
+
+        Returns:
+            HopTable: The table.
+
+        Raises:
+            ValueError: If some hop count does not fit in 16 bits.
+        """
+        graph = time_map
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_time_map(time_map)
+        reverse = graph.reverse()
+        reverse_arrays = (reverse.offsets, reverse.neighbors)
+        node_count = graph.node_count()
+        for width in sorted(TYPECODES):
+            blocks = [
+                (lo, min(lo + block_size, node_count), width)
+                for lo in range(0, node_count, block_size)
+            ]
+            if workers > 1 and len(blocks) > 1:
+                context = multiprocessing.get_context()
+                with context.Pool(
+                    workers, initializer=_init_worker, initargs=(reverse_arrays,)
+                ) as pool:
+                    results = pool.map(_run_block, blocks)
+            else:
+                results = [_hop_block(reverse_arrays, *block) for block in blocks]
+            if None not in results:
+                break
+        else:
+            raise ValueError("Hop counts do not fit in 16 bits")
+        table = bytearray(node_count * node_count * width)
+        for (lo, hi, _), result in zip(blocks, results):
+            row_bytes = (hi - lo) * width
+            for node_id in range(node_count):
+                offset = (node_id * node_count + lo) * width
+                table[offset : offset + row_bytes] = result[
+                    node_id * row_bytes : (node_id + 1) * row_bytes
+                ]
+        hops = array(TYPECODES[width])
+        hops.frombytes(table)
+        if sys.byteorder == "big":
+            hops.byteswap()
+        return cls(list(graph.names), hops)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads a table written by save().
+
+        Args:
+            filename (str): The file to read.
+
+        Returns:
+            HopTable: The loaded table.
+        """
+        with open(filename, "rb") as file:
+            state = pickle.load(file)
+        return cls(state["names"], state["hops"])
+
+    def save(self, filename):
+        """
+        Writes the table to disk.
+
+        Args:
+            filename (str): The file to write.
+        """
+        state = {"names": self.names, "hops": self.hops}
+        with open(filename, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def estimate(self, node, goal):
+        """
+        Gets the fewest hops from node to goal, as dis_map[node][goal] would.
+
+        Args:
+            node (str): The current node.
+            goal (str): The goal node.
+
+        Returns:
+            float: The hop count, or infinity if goal cannot be reached.
+
+        Raises:
+            KeyError: If a node is not in the table.
+        """
+        hops = self.hops[self.ids[node] * len(self.names) + self.ids[goal]]
+        return INFINITY if hops == self.unreachable else hops
+
+
+def _init_worker(reverse_arrays):
+    """
+    Stores the reversed graph in a worker process.
+    """
+    global _worker_graph
+    _worker_graph = reverse_arrays
+
+
+def _run_block(block):
+    """
+    Computes one block of goals in a worker process.
+    """
+    return _hop_block(_worker_graph, *block)
+
+
+def _hop_block(reverse_arrays, lo, hi, width):
+    """
+    Computes the hops from every node to the goals lo to hi - 1 with one
+    bit-parallel BFS over the reversed graph.
+
+    Args:
+        reverse_arrays (tuple): The (offsets, neighbors) arrays of the
+                                reversed graph.
+        lo (int): The first goal id.
+        hi (int): The goal id after the last one.
+        width (int): The bytes per hop count.
+
+    Returns:
+        bytes or None: For each node in turn, its hops to the goals as
+                       little-endian integers of width bytes, or None if a
+                       hop count does not fit in width bytes.
+    """
+    offsets, neighbors = reverse_arrays
+    node_count = len(offsets) - 1
+    unreachable = (1 << (8 * width)) - 1
+    visited = [0] * node_count
+    frontier = {}
+    for goal_id in range(lo, hi):
+        visited[goal_id] = frontier[goal_id] = 1 << (goal_id - lo)
+    rows = [0] * node_count
+    level = 0
+    while frontier:
+        level += 1
+        if level >= unreachable:
+            return None
+        reached = {}
+        for node_id, mask in frontier.items():
+            for parent_id in neighbors[offsets[node_id] : offsets[node_id + 1]]:
+                new_mask = mask & ~visited[parent_id]
+                if new_mask:
+                    reached[parent_id] = reached.get(parent_id, 0) | new_mask
+                    visited[parent_id] |= new_mask
+        for node_id, mask in reached.items():
+            rows[node_id] |= _spread(mask, width) * level
+        frontier = reached
+    all_goals = (1 << (hi - lo)) - 1
+    row_bytes = (hi - lo) * width
+    result = bytearray()
+    for node_id in range(node_count):
+        missing = all_goals & ~visited[node_id]
+        if missing:
+            rows[node_id] |= _spread(missing, width) * unreachable
+        result += rows[node_id].to_bytes(row_bytes, "little")
+    return bytes(result)
+
+
+def _spread(mask, width):
+    """
+    Spreads the bits of a mask apart so bit i becomes the value of the i-th
+    field of width bytes.
+    """
+    bits = format(mask, "b").encode("ascii").translate(_BIT_VALUES)
+    if width == 1:
+        return int.from_bytes(bits, "big")
+    fields = bytearray(len(bits) * width)
+    fields[width - 1 :: width] = bits
+    return int.from_bytes(fields, "big")
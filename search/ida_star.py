@@ -0,0 +1,135 @@
+"""
+Implementation of IDA*.
+"""
+
+from collections import OrderedDict
+
+from expand import expand_with_costs
+from heuristics import heuristic
+
+
+def ida_star_search(dis_map, time_map, start, end, cache_size=0):
+    """
+    Performs Iterative-Deepening A* (IDA*) to find the path from start to
+    end. Each iteration is a depth-first search that cuts off every path
+    whose f-score exceeds a bound; the next bound is the smallest f-score
+    that was cut off. Only the current path is kept, so memory grows with
+    the path depth instead of with the number of nodes reached, at the cost
+    of re-expanding nodes across iterations and along different paths.
+
+    A transposition cache trades some of that repeated work back for
+    memory: it remembers the cheapest g-score each node was reached with in
+    the current iteration and prunes later arrivals that are no cheaper.
+    It holds at most cache_size nodes and forgets the least recently used.
+
+    Args:
+        dis_map (dict or Landmarks): A dictionary containing the distance
+                                     (hops) map, or any object with an
+                                     estimate(node, goal) method.
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        cache_size (int): The most nodes the transposition cache holds; 0
+                          disables it.
+
+    Returns:
+        list or None: The shortest path from start to end, or None if no path
+                      is found.
+    """
+    estimate = heuristic(dis_map)
+    bound = estimate(start, end)
+    while True:
+        cache = _TranspositionCache(cache_size) if cache_size > 0 else None
+        path, next_bound = _bounded_search(time_map, start, end, estimate, bound, cache)
+        if path is not None:
+            return path
+        if next_bound == float("inf"):
+            return None
+        bound = next_bound
+
+
+def _bounded_search(time_map, start, end, estimate, bound, cache):
+    """
+    Runs one depth-first iteration of IDA*.
+
+    Args:
+        time_map (dict or CSRGraph): The adjacency map.
+        start (str): The starting node.
+        end (str): The goal node.
+        estimate (callable): The heuristic, as a function of (node, goal).
+        bound (float): The largest f-score allowed in this iteration.
+        cache (_TranspositionCache): The transposition cache, or None.
+
+    Returns:
+        tuple: The path found or None, and the smallest f-score that was
+               cut off.
+    """
+    next_bound = float("inf")
+    if start == end:
+        return [start], next_bound
+    path = [start]
+    g_n_scores = [0]
+    on_path = {start}
+    children = [iter(expand_with_costs(start, time_map))]
+    while children:
+        try:
+            neighbor, cost = next(children[-1])
+        except StopIteration:
+            children.pop()
+            on_path.discard(path.pop())
+            g_n_scores.pop()
+            continue
+        if neighbor in on_path:
+            continue
+        new_g_n_score = g_n_scores[-1] + cost
+        f_n_score = new_g_n_score + estimate(neighbor, end)
+        if f_n_score > bound:
+            next_bound = min(next_bound, f_n_score)
+            continue
+        if neighbor == end:
+            return path + [neighbor], next_bound
+        if cache is not None and not cache.visit(neighbor, new_g_n_score):
+            continue
+        path.append(neighbor)
+        g_n_scores.append(new_g_n_score)
+        on_path.add(neighbor)
+        children.append(iter(expand_with_costs(neighbor, time_map)))
+    return None, next_bound
+
+
+class _TranspositionCache:
+    """
+    A bounded least-recently-used map from node to the cheapest g-score it
+    was reached with.
+
+    Attributes:
+        capacity: The most nodes held.
+        g_n_scores: Ordered dictionary of node to g-score, oldest first.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.g_n_scores = OrderedDict()
+
+    def visit(self, node, g_n_score):
+        """
+        Records a visit to a node.
+
+        Args:
+            node (str): The node reached.
+            g_n_score (float): The cost of the path it was reached by.
+
+        Returns:
+            bool: False if the node was already reached at most as cheaply,
+                  True if this visit should be expanded.
+        """
+        best = self.g_n_scores.get(node)
+        if best is not None and best <= g_n_score:
+            self.g_n_scores.move_to_end(node)
+            return False
+        self.g_n_scores[node] = g_n_score
+        self.g_n_scores.move_to_end(node)
+        if len(self.g_n_scores) > self.capacity:
+            self.g_n_scores.popitem(last=False)
+        return True
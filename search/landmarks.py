@@ -0,0 +1,129 @@
+"""
+Implementation of the landmark (ALT) heuristic.
+"""
+
+from array import array
+
+from data_utils import CSRGraph
+from ucs import shortest_path_arrays
+
+INFINITY = float("inf")
+
+
+class Landmarks:
+    """
+    Admissible A* heuristic built from a few landmark nodes (the ALT
+    technique). For every landmark L the exact costs d(L, v) and d(v, L) are
+    precomputed for all nodes v. By the triangle inequality both
+    d(L, goal) - d(L, node) and d(node, L) - d(goal, L) are lower bounds on
+    d(node, goal), and the estimate is the largest of them. A Landmarks
+    object can be passed to a_star_search in place of dis_map; it takes
+    O(kV) memory instead of the O(V^2) of a full distance map.
+
+    Attributes:
+        graph: The CSRGraph the distances were computed on.
+        landmarks: Names of the landmark nodes.
+        distances_from: One array per landmark of d(L, v), indexed by node id.
+        distances_to: One array per landmark of d(v, L), indexed by node id.
+    """
+
+    def __init__(self, time_map, k=8, landmarks=None):
+        """
+        Picks the landmarks and runs one forward and one backward search
+        from each.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            k (int): The number of landmarks to pick.
+            landmarks (list): Optional landmark names to use instead of
+                              picking them.
+        """
+        if isinstance(time_map, dict):
+            time_map = CSRGraph.from_time_map(time_map)
+        self.graph = time_map
+        self.distances_from = []
+        self.distances_to = []
+        if landmarks is None:
+            landmark_ids = self._pick_farthest(k)
+        else:
+            landmark_ids = [self.graph.id_of(name) for name in landmarks]
+            for landmark_id in landmark_ids:
+                self._add(landmark_id)
+        self.landmarks = [self.graph.name_of(node_id) for node_id in landmark_ids]
+
+    def estimate(self, node, goal):
+        """
+        Estimates the cost from node to goal without overestimating it.
+
+        Args:
+            node (str): The node to estimate from.
+            goal (str): The goal node.
+
+        Returns:
+            float: A lower bound on the cost of any path from node to goal.
+        """
+        node_id = self.graph.ids[node]
+        goal_id = self.graph.ids[goal]
+        best = 0
+        for distances in self.distances_from:
+            to_goal, to_node = distances[goal_id], distances[node_id]
+            if to_goal != INFINITY and to_node != INFINITY and to_goal - to_node > best:
+                best = to_goal - to_node
+        for distances in self.distances_to:
+            from_node, from_goal = distances[node_id], distances[goal_id]
+            if (
+                from_node != INFINITY
+                and from_goal != INFINITY
+                and from_node - from_goal > best
+            ):
+                best = from_node - from_goal
+        return best
+
+    def _pick_farthest(self, k):
+        """
+        Picks landmarks by farthest-point selection: each new landmark is the
+        node whose distance to the closest landmark picked so far is the
+        largest, starting from the node farthest from node 0. Nodes that no
+        landmark reaches are picked first, so every component gets one.
+
+        Args:
+            k (int): The number of landmarks to pick.
+
+        Returns:
+            list: The landmark node ids.
+        """
+        node_count = self.graph.node_count()
+        if node_count == 0:
+            return []
+        closest, _ = shortest_path_arrays(self.graph, 0)
+        landmark_ids = []
+        for _ in range(min(k, node_count)):
+            landmark_id = max(range(node_count), key=closest.__getitem__)
+            if landmark_id in landmark_ids:
+                break
+            landmark_ids.append(landmark_id)
+            distances = self._add(landmark_id)
+            if len(landmark_ids) == 1:
+                closest = distances
+            else:
+                closest = array("d", [min(pair) for pair in zip(closest, distances)])
+        return landmark_ids
+
+    def _add(self, landmark_id):
+        """
+        Computes and stores the distance arrays of one landmark.
+
+        Args:
+            landmark_id (int): The id of the landmark node.
+
+        Returns:
+            array: The distances from the landmark.
+        """
+        distances, _ = shortest_path_arrays(self.graph, landmark_id)
+        self.distances_from.append(distances)
+        self.distances_to.append(
+            shortest_path_arrays(self.graph.reverse(), landmark_id)[0]
+        )
+        return distances
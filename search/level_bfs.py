@@ -0,0 +1,76 @@
+"""
+Implementation of level-synchronous BFS over a CSRGraph.
+"""
+
+from array import array
+
+UNREACHED = -1
+
+
+def breadth_first_levels(graph, start):
+    """
+    Performs Breadth-First Search from start to every node, one whole level
+    at a time. The frontier is a list of node ids and every level is a pass
+    over the CSR rows of the frontier, marking unreached neighbors in flat
+    distance and parent arrays, so no per-node dictionaries, queue nodes or
+    name lookups are made. Frontier nodes are visited in the order they were
+    reached and their neighbors in row order, which gives every node the
+    same parent breadth_first_search would give it.
+
+    Args:
+        graph (CSRGraph): The compiled graph. Compile a time_map dictionary
+                          with CSRGraph.from_time_map first.
+        start (str): The starting node.
+
+    Returns:
+        tuple: Arrays (distances, parents) indexed by node id. distances
+               holds each node's hop count from start and parents the id of
+               the node it was reached from; both hold UNREACHED for nodes
+               that cannot be reached, and parents also for start.
+    """
+    node_count = graph.node_count()
+    distances = array("i", [UNREACHED]) * node_count
+    parents = array("i", [UNREACHED]) * node_count
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    start_id = graph.id_of(start)
+    distances[start_id] = 0
+    frontier = [start_id]
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for node_id in frontier:
+            for child_id in neighbors[offsets[node_id] : offsets[node_id + 1]]:
+                if distances[child_id] == UNREACHED:
+                    distances[child_id] = level
+                    parents[child_id] = node_id
+                    next_frontier.append(child_id)
+        frontier = next_frontier
+    return distances, parents
+
+
+def level_path(graph, parents, start, end):
+    """
+    Extracts the path to a node from the parent array of
+    breadth_first_levels. It is the path breadth_first_search returns.
+
+    Args:
+        graph (CSRGraph): The graph the levels were computed on.
+        parents (array): The parent array.
+        start (str): The node the levels were computed from.
+        end (str): The goal node.
+
+    Returns:
+        list or None: The path from start to end, or None if no path is found.
+    """
+    start_id = graph.id_of(start)
+    node_id = graph.id_of(end)
+    if node_id != start_id and parents[node_id] == UNREACHED:
+        return None
+    path = []
+    while node_id != UNREACHED:
+        path.append(graph.name_of(node_id))
+        node_id = parents[node_id]
+    path.reverse()
+    return path
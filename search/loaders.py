@@ -0,0 +1,147 @@
+"""
+Defines streaming loaders that build search graphs from edge-list files.
+"""
+
+import csv
+
+from data_utils import GraphBuilder
+
+
+def load_edge_list(filename, delimiter=None, undirected=False, header=False):
+    """
+    Builds a CSRGraph from an edge-list file, one "person person time" edge
+    per line. The file is read line by line: names are interned as they
+    are first seen and edges go straight into flat arrays, so parsing holds
+    no per-line Python objects. A missing time column means a time of 1.
+    Blank lines and lines starting with # are skipped.
+
+    Args:
+        filename (str): The file to read.
+        delimiter (str): The column separator, e.g. "," for CSV files; None
+                         splits on whitespace.
+        undirected (bool): If True, every edge is also added in the reverse
+                           direction.
+        header (bool): Whether the first line holds column names.
+
+    Returns:
+        CSRGraph: The graph, usable by every search in this package.
+
+    Raises:
+        ValueError: If a line does not have two or three columns, or its
+                    time is not a number.
+    """
+    builder = GraphBuilder()
+    for line_number, columns in _rows(filename, delimiter, header):
+        if len(columns) not in (2, 3):
+            raise ValueError(
+                f"{filename}:{line_number}: expected 2 or 3 columns, "
+                f"got {len(columns)}"
+            )
+        weight = _number(columns[2], filename, line_number) if len(columns) == 3 else 1
+        builder.add_edge(columns[0], columns[1], weight)
+        if undirected:
+            builder.add_edge(columns[1], columns[0], weight)
+    return builder.build()
+
+
+def load_hop_distances(filename, graph, delimiter=None, header=False):
+    """
+    Reads a hop-distance file, one "person person hops" entry per line, to
+    use in place of dis_map. Pairs missing from the file are estimated as 0,
+    which keeps the heuristic admissible. Names not in the graph are skipped.
+
+    Args:
+        filename (str): The file to read.
+        graph (CSRGraph): The graph the distances belong to.
+        delimiter (str): The column separator, e.g. "," for CSV files; None
+                         splits on whitespace.
+        header (bool): Whether the first line holds column names.
+
+    Returns:
+        HopDistances: The distances.
+
+    Raises:
+        ValueError: If a line does not have three columns, or its hop count
+                    is not a number.
+    """
+    distances = HopDistances(graph)
+    for line_number, columns in _rows(filename, delimiter, header):
+        if len(columns) != 3:
+            raise ValueError(
+                f"{filename}:{line_number}: expected 3 columns, got {len(columns)}"
+            )
+        node_id = graph.ids.get(columns[0])
+        goal_id = graph.ids.get(columns[1])
+        if node_id is not None and goal_id is not None:
+            distances.add(node_id, goal_id, _number(columns[2], filename, line_number))
+    return distances
+
+
+class HopDistances:
+    """
+    Represents a sparse table of hop distances between node ids. It can be
+    passed to a_star_search in place of dis_map.
+
+    Attributes:
+        graph: The graph the distances belong to.
+        distances: Dictionary of node_id * V + goal_id to hop count.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.distances = {}
+
+    def add(self, node_id, goal_id, hops):
+        """
+        Records the hop distance between two node ids.
+        """
+        self.distances[node_id * self.graph.node_count() + goal_id] = hops
+
+    def estimate(self, node, goal):
+        """
+        Estimates the cost from node to goal.
+
+        Args:
+            node (str): The node to estimate from.
+            goal (str): The goal node.
+
+        Returns:
+            float: The recorded hop count, or 0 if there is none.
+        """
+        ids = self.graph.ids
+        return self.distances.get(ids[node] * self.graph.node_count() + ids[goal], 0)
+
+
+def _rows(filename, delimiter, header):
+    """
+    Streams the non-blank, non-comment rows of a delimited file.
+
+    Yields:
+        tuple: The line number and the list of stripped columns.
+    """
+    with open(filename, newline="", encoding="utf-8") as file:
+        if delimiter is None:
+            lines = (line.split() for line in file)
+        else:
+            lines = csv.reader(file, delimiter=delimiter)
+        for line_number, columns in enumerate(lines, 1):
+            if header and line_number == 1:
+                continue
+            columns = [column.strip() for column in columns]
+            if not columns or not columns[0] or columns[0].startswith("#"):
+                continue
+            yield line_number, columns
+
+
+def _number(text, filename, line_number):
+    """
+    Parses an int or float column.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"{filename}:{line_number}: not a number: {text!r}") from None
@@ -0,0 +1,217 @@
+"""
+Implementation of Lifelong Planning A* (LPA*).
+"""
+
+from data_utils import HeapPriorityQueue
+from expand import expand_with_costs
+from heuristics import heuristic
+
+INFINITY = float("inf")
+
+
+class LPAStarPlanner:
+    """
+    Plans the shortest path between a fixed start and end on a graph whose
+    edges change, keeping the search state between calls. After an edge
+    changes, only the nodes whose cost from start is affected are expanded
+    again, instead of rerunning A* from scratch.
+
+    Each node keeps its g-score and an rhs-score, the one-step lookahead
+    min(g(parent) + cost(parent, node)) over its parents. Nodes where the
+    two differ are inconsistent and queued by the key
+    (min(g, rhs) + h, min(g, rhs)). The heuristic must be consistent, as
+    the hop counts of a dis_map are when every edge costs at least 1.
+
+    Attributes:
+        time_map: The graph planned on.
+        start: The starting node.
+        end: The goal node.
+        g_n_scores: Dictionary of the settled cost of each node from start.
+        rhs_scores: Dictionary of the lookahead cost of each node.
+        predecessors: Dictionary mapping each node to a dictionary of its
+                      parents and the edge costs from them.
+        frontier: HeapPriorityQueue of the inconsistent nodes.
+    """
+
+    def __init__(self, dis_map, time_map, start, end):
+        """
+        Initializes the planner. No search is run until shortest_path is
+        called. If time_map has an add_listener method, as VersionedTimeMap
+        does, the planner subscribes to its edge changes; for a plain
+        dictionary, call edge_changed after changing an edge. A CSRGraph
+        cannot change, so it can be planned on but not updated.
+
+        Args:
+            dis_map (dict or Landmarks): A dictionary containing the distance
+                                         (hops) map, or any object with an
+                                         estimate(node, goal) method.
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            start (str): The starting node.
+            end (str): The goal node.
+        """
+        self.time_map = time_map
+        self.start = start
+        self.end = end
+        self._estimate = heuristic(dis_map)
+        self.g_n_scores = {}
+        self.rhs_scores = {start: 0}
+        self.predecessors = {}
+        for node in time_map:
+            for child, cost in expand_with_costs(node, time_map):
+                self.predecessors.setdefault(child, {})[node] = cost
+        self.frontier = HeapPriorityQueue()
+        self._enqueue(start)
+        if hasattr(time_map, "add_listener"):
+            time_map.add_listener(self.edge_changed)
+
+    def shortest_path(self, stats=None):
+        """
+        Repairs the search after any edge changes and gets the shortest path.
+
+        Args:
+            stats (SearchStats): Optional statistics to record into.
+
+        Returns:
+            list or None: The shortest path from start to end, or None if no
+                          path is found.
+        """
+        if stats is not None:
+            stats.start()
+        self._compute_shortest_path(stats)
+        if stats is not None:
+            stats.stop()
+        if self._g(self.end) == INFINITY:
+            return None
+        path = [self.end]
+        node = self.end
+        while node != self.start:
+            node = min(
+                self.predecessors[node].items(),
+                key=lambda item: self._g(item[0]) + item[1],
+            )[0]
+            path.append(node)
+        return path[::-1]
+
+    def cost(self):
+        """
+        Gets the cost of the shortest path found by the last shortest_path
+        call.
+
+        Returns:
+            float: The cost, or infinity if there is no path.
+        """
+        return self._g(self.end)
+
+    def edge_changed(self, source, target):
+        """
+        Notifies the planner that an edge was added, removed or reweighted.
+        The new weight is read from the map, where a missing or None entry
+        means the edge was removed.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+
+        Raises:
+            TypeError: If the planner's time_map is not a dictionary.
+        """
+        if not isinstance(self.time_map, dict):
+            raise TypeError(
+                "Edge updates need a dictionary time_map, such as VersionedTimeMap"
+            )
+        row = self.time_map.get(source) or {}
+        weight = row.get(target)
+        parents = self.predecessors.setdefault(target, {})
+        if weight is None:
+            parents.pop(source, None)
+        else:
+            parents[source] = weight
+        self._update_node(target)
+
+    def close(self):
+        """
+        Stops listening for changes to the graph.
+        """
+        if hasattr(self.time_map, "remove_listener"):
+            self.time_map.remove_listener(self.edge_changed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _g(self, node):
+        return self.g_n_scores.get(node, INFINITY)
+
+    def _rhs(self, node):
+        return self.rhs_scores.get(node, INFINITY)
+
+    def _enqueue(self, node):
+        """
+        Queues an inconsistent node by its key.
+        """
+        score = min(self._g(node), self._rhs(node))
+        self.frontier.enqueue(node, None, score + self._estimate(node, self.end), score)
+
+    def _update_node(self, node):
+        """
+        Recomputes the rhs-score of a node from its parents and queues it
+        if it is inconsistent.
+        """
+        if node != self.start:
+            self.rhs_scores[node] = min(
+                (
+                    self._g(parent) + cost
+                    for parent, cost in self.predecessors.get(node, {}).items()
+                ),
+                default=INFINITY,
+            )
+        self._requeue(node)
+
+    def _requeue(self, node):
+        """
+        Queues a node by its current key if it is inconsistent, or takes it
+        off the queue if it is consistent.
+        """
+        if self._g(node) != self._rhs(node):
+            self._enqueue(node)
+        elif self.frontier.is_exists(node):
+            self.frontier.remove(node)
+
+    def _compute_shortest_path(self, stats):
+        """
+        Expands inconsistent nodes until the goal is consistent and no
+        queued node could lower its cost.
+        """
+        end = self.end
+        while not self.frontier.is_empty():
+            end_score = min(self._g(end), self._rhs(end))
+            end_key = (end_score + self._estimate(end, end), end_score)
+            if self.frontier.peek_priority() >= end_key and self._rhs(end) == self._g(
+                end
+            ):
+                break
+            node, _ = self.frontier.dequeue()
+            if stats is not None:
+                stats.expand(node)
+            old_g_n_score = self._g(node)
+            children = expand_with_costs(node, self.time_map)
+            if old_g_n_score > self._rhs(node):
+                # overconsistent: settle node, which can only lower the
+                # rhs-scores of its children
+                g_n_score = self.g_n_scores[node] = self._rhs(node)
+                for child, cost in children:
+                    if child != self.start and g_n_score + cost < self._rhs(child):
+                        self.rhs_scores[child] = g_n_score + cost
+                        self._requeue(child)
+            else:
+                # underconsistent: unsettle node and recompute every child
+                # whose rhs-score came through it
+                self.g_n_scores[node] = INFINITY
+                self._update_node(node)
+                for child, cost in children:
+                    if self._rhs(child) == old_g_n_score + cost:
+                        self._update_node(child)
@@ -0,0 +1,132 @@
+"""
+Implementation of a process-pool runner for batches of search queries.
+"""
+
+import multiprocessing
+
+from algorithms import ALGORITHMS
+
+# graphs registered in the parent for forked workers to inherit, by runner
+_shared_maps = {}
+# the (dis_map, time_map) each worker process searches; set once per worker
+_worker_maps = None
+
+
+class ParallelSearchRunner:
+    """
+    Runs independent (algorithm, start, end) queries on a pool of worker
+    processes. The graph is handed to each worker once, when the pool
+    starts: under the fork start method workers inherit it from the parent
+    without any copying or pickling, otherwise it is pickled once per
+    worker, and a MappedGraph is mapped again from its file rather than
+    copied. Jobs then only carry the algorithm name and the two endpoints.
+
+    Attributes:
+        workers: The number of worker processes.
+        pool: The multiprocessing pool.
+    """
+
+    def __init__(self, time_map, dis_map=None, workers=None):
+        """
+        Starts the worker pool.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            dis_map (dict or Landmarks): The distance map or heuristic used
+                                         by the A* algorithms, if any.
+            workers (int): The number of worker processes; defaults to the
+                           number of CPUs.
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        context = multiprocessing.get_context()
+        self._key = id(self)
+        if context.get_start_method() == "fork":
+            # stays registered until close() so replacement workers see it too
+            _shared_maps[self._key] = (dis_map, time_map)
+            initargs = (self._key, None)
+        else:
+            initargs = (None, (dis_map, time_map))
+        self.pool = context.Pool(
+            self.workers, initializer=_init_worker, initargs=initargs
+        )
+
+    def run(self, jobs, chunksize=1):
+        """
+        Runs a batch of queries and streams back each result as soon as it
+        completes, in completion order.
+
+        Args:
+            jobs (iterable): (algorithm, start, end) triples, where algorithm
+                             is a key of ALGORITHMS.
+            chunksize (int): The number of jobs sent to a worker at a time.
+                             Larger chunks cut scheduling overhead for many
+                             cheap queries.
+
+        Returns:
+            iterator: (job, path) pairs, where job is the (algorithm, start,
+                      end) triple and path is None if no path is found.
+
+        Raises:
+            ValueError: While iterating, if a job names an unknown
+                        algorithm.
+        """
+        return self.pool.imap_unordered(_run_job, jobs, chunksize)
+
+    def submit(self, job, callback, error_callback):
+        """
+        Runs one query without waiting for it. One of the callbacks is
+        called, from a thread of the pool, when the query completes.
+
+        Args:
+            job (tuple): The (algorithm, start, end) triple, where algorithm
+                         is a key of ALGORITHMS.
+            callback (callable): Called with the (job, path) pair on success.
+            error_callback (callable): Called with the exception if the
+                                       query fails, e.g. with ValueError for
+                                       an unknown algorithm.
+        """
+        self.pool.apply_async(
+            _run_job, (job,), callback=callback, error_callback=error_callback
+        )
+
+    def close(self):
+        """
+        Stops the worker pool.
+        """
+        self.pool.terminate()
+        self.pool.join()
+        _shared_maps.pop(self._key, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _init_worker(key, maps):
+    """
+    Stores the graph in a worker process, either inherited from the parent
+    under key or passed in as maps.
+    """
+    global _worker_maps
+    _worker_maps = _shared_maps[key] if maps is None else maps
+
+
+def _run_job(job):
+    """
+    Runs one query in a worker process.
+
+    Args:
+        job (tuple): The (algorithm, start, end) triple.
+
+    Returns:
+        tuple: The job and its path.
+    """
+    algorithm, start, end = job
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    dis_map, time_map = _worker_maps
+    return job, ALGORITHMS[algorithm](dis_map, time_map, start, end)
@@ -0,0 +1,163 @@
+"""
+Implementation of an LRU cache of search results.
+"""
+
+import sys
+from collections import OrderedDict
+
+from algorithms import ALGORITHMS
+
+
+class PathCache:
+    """
+    Answers (algorithm, start, end) queries on one graph, remembering the
+    most recently used results. Entries are keyed on the algorithm, the
+    endpoints and the graph's version, so a result is only served for the
+    exact graph it was computed on. When the graph is a VersionedTimeMap,
+    every edge change bumps its version and the cache drops the entries
+    computed before it; a plain dictionary or CSRGraph is treated as never
+    changing.
+
+    Attributes:
+        time_map: The graph searched.
+        dis_map: The distance map or heuristic used by the A* algorithms.
+        max_entries: The most results held.
+        max_bytes: The most bytes of results held, as estimated by
+                   sys.getsizeof over each path and its nodes.
+        entries: Ordered dictionary of key to (path, bytes), oldest first.
+        size_bytes: The estimated bytes of the results held.
+        hits: Number of queries answered from the cache.
+        misses: Number of queries that ran a search.
+        evictions: Number of results dropped to stay within the limits.
+        invalidations: Number of results dropped because the graph changed.
+    """
+
+    def __init__(self, time_map, dis_map=None, max_entries=1024, max_bytes=None):
+        """
+        Initializes an empty PathCache.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, a VersionedTimeMap,
+                                         or a compiled CSRGraph.
+            dis_map (dict or Landmarks): The distance map or heuristic used
+                                         by the A* algorithms, if any.
+            max_entries (int): The most results held.
+            max_bytes (int): The most bytes of results held; None for no
+                             byte limit.
+        """
+        self.time_map = time_map
+        self.dis_map = dis_map
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if hasattr(time_map, "add_listener"):
+            time_map.add_listener(self._on_edge_changed)
+
+    def search(self, algorithm, start, end):
+        """
+        Gets the path found by an algorithm, running it only on a miss.
+
+        Args:
+            algorithm (str): A key of algorithms.ALGORITHMS.
+            start (str): The starting node.
+            end (str): The goal node.
+
+        Returns:
+            list or None: The path from start to end, or None if no path is
+                          found.
+
+        Raises:
+            ValueError: If the algorithm is unknown.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        key = (algorithm, start, end, getattr(self.time_map, "version", 0))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return _copy(entry[0])
+        self.misses += 1
+        path = ALGORITHMS[algorithm](self.dis_map, self.time_map, start, end)
+        size = _path_bytes(path)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return path
+        self.entries[key] = (_copy(path), size)
+        self.size_bytes += size
+        while len(self.entries) > self.max_entries or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+        return path
+
+    def clear(self):
+        """
+        Drops every result held. Counters are kept.
+        """
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def close(self):
+        """
+        Stops listening for changes to the graph.
+        """
+        if hasattr(self.time_map, "remove_listener"):
+            self.time_map.remove_listener(self._on_edge_changed)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def as_dict(self):
+        """
+        Gets the counters as a dictionary, e.g. for logging or JSON.
+
+        Returns:
+            dict: The counters, entries held and bytes held.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self.entries),
+            "bytes": self.size_bytes,
+        }
+
+    def _on_edge_changed(self, source, target):
+        """
+        Drops the results computed on an older version of the graph. Every
+        result becomes stale: a new or cheaper edge can shorten any path
+        and a removed one can break any path through it.
+        """
+        self.invalidations += len(self.entries)
+        self.clear()
+
+
+def _copy(path):
+    """
+    Copies a path so callers cannot modify a cached result.
+    """
+    return None if path is None else list(path)
+
+
+def _path_bytes(path):
+    """
+    Estimates the memory held by a cached path.
+    """
+    if path is None:
+        return sys.getsizeof(None)
+    return sys.getsizeof(path) + sum(sys.getsizeof(node) for node in path)
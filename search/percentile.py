@@ -0,0 +1,20 @@
+"""
+Defines a percentile function for summarizing latency samples.
+"""
+
+
+def percentile(samples, fraction):
+    """
+    Gets a percentile of a list of samples.
+
+    Args:
+        samples (list): The samples.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The sample at that percentile, or None if there are none.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
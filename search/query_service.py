@@ -0,0 +1,414 @@
+"""
+Implementation of a local asyncio path-query server and its client.
+
+Usage: python query_service.py GRAPH_FILE [--socket PATH] [--workers N]
+                               [--max-pending N]
+
+The server holds one graph in memory and answers (algorithm, start, end)
+queries over a unix socket. Messages are JSON objects, one per line:
+
+    request   {"id": 1, "algorithm": "a_star", "start": "A", "end": "B"}
+    response  {"id": 1, "path": ["A", "B"]}  or  {"id": 1, "error": "..."}
+    request   {"id": 2, "command": "metrics"}
+    response  {"id": 2, "metrics": {...}}
+
+A connection may send many requests without waiting; responses carry the
+request's id and come back in completion order.
+"""
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import time
+
+from graph_file import load_graph
+from parallel import ParallelSearchRunner
+from percentile import percentile
+
+DEFAULT_SOCKET = "/tmp/search.sock"
+# latencies kept for the metrics percentiles
+LATENCY_WINDOW = 10000
+
+
+class PathQueryServer:
+    """
+    Serves path queries on one graph. Searches run on a
+    ParallelSearchRunner, whose worker processes receive the graph once, so
+    the event loop only parses and routes messages and never blocks on a
+    search. Identical (algorithm, start, end) queries that arrive while one
+    is running share its result instead of searching again. At most
+    max_pending queries are accepted at a time; beyond that the server
+    stops reading from its connections until some finish, which pushes back
+    on the clients.
+
+    Attributes:
+        socket_path: The unix socket the server listens on.
+        workers: The number of worker processes.
+        runner: The ParallelSearchRunner, once started.
+        max_pending: The most queries accepted and not yet answered.
+        requests: Number of queries received.
+        coalesced: Number of queries answered by a search already running.
+        errors: Number of queries answered with an error.
+        searches: Number of searches run.
+        latencies: Deque of the latest query latencies in seconds.
+    """
+
+    def __init__(
+        self,
+        time_map,
+        dis_map=None,
+        socket_path=DEFAULT_SOCKET,
+        workers=None,
+        max_pending=1024,
+    ):
+        """
+        Initializes the server. It does not listen until start is awaited.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            dis_map (dict or Landmarks): The distance map or heuristic used
+                                         by the A* algorithms, if any.
+            socket_path (str): The unix socket to listen on.
+            workers (int): The number of worker processes; defaults to the
+                           number of CPUs.
+            max_pending (int): The most queries accepted at a time.
+        """
+        self.socket_path = socket_path
+        self.workers = workers
+        self.runner = None
+        self.max_pending = max_pending
+        self.requests = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.searches = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._maps = (dis_map, time_map)
+        self._in_flight = {}
+        self._pending = None
+        self._pending_count = 0
+        self._server = None
+
+    async def start(self):
+        """
+        Starts the worker pool and listens on the socket. The workers start
+        first, so they do not inherit the sockets of any connection.
+        """
+        dis_map, time_map = self._maps
+        self.runner = ParallelSearchRunner(time_map, dis_map, self.workers)
+        self.workers = self.runner.workers
+        self._pending = asyncio.Semaphore(self.max_pending)
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+
+    async def serve_forever(self):
+        """
+        Answers queries until the server is closed or the task cancelled.
+        """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and stops the worker pool.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.runner is not None:
+            self.runner.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def metrics(self):
+        """
+        Gets the counters and latency percentiles of the server.
+
+        Returns:
+            dict: The counters, queries pending, and p50/p99/max latency in
+                  milliseconds over the latest LATENCY_WINDOW queries.
+        """
+        latencies = [latency * 1000 for latency in self.latencies]
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "searches": self.searches,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+            "pending": self._pending_count,
+            "latency_ms": {
+                "p50": percentile(latencies, 0.5),
+                "p99": percentile(latencies, 0.99),
+                "max": max(latencies) if latencies else None,
+            },
+        }
+
+    async def query(self, algorithm, start, end):
+        """
+        Answers one query, joining an identical one already running.
+
+        Args:
+            algorithm (str): A key of algorithms.ALGORITHMS.
+            start (str): The starting node.
+            end (str): The goal node.
+
+        Returns:
+            list or None: The path from start to end, or None if no path is
+                          found.
+
+        Raises:
+            ValueError: If the algorithm is unknown.
+            KeyError: If a node is not in the graph.
+        """
+        job = (algorithm, start, end)
+        future = self._in_flight.get(job)
+        if future is None:
+            self.searches += 1
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.runner.submit(
+                job,
+                lambda result: loop.call_soon_threadsafe(_resolve, future, result),
+                lambda error: loop.call_soon_threadsafe(_reject, future, error),
+            )
+            self._in_flight[job] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(job, None))
+        else:
+            self.coalesced += 1
+        _, path = await asyncio.shield(future)
+        return path
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Reads the requests of one connection and answers each as it
+        completes.
+        """
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                await self._pending.acquire()
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    line = b""
+                if not line:
+                    self._pending.release()
+                    break
+                self._pending_count += 1
+                task = asyncio.ensure_future(
+                    self._answer(line, writer, write_lock, time.perf_counter())
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _answer(self, line, writer, write_lock, received):
+        """
+        Answers one request line and releases its pending slot.
+        """
+        try:
+            response = await self._respond(line)
+            if "path" in response:
+                self.latencies.append(time.perf_counter() - received)
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._pending_count -= 1
+            self._pending.release()
+
+    async def _respond(self, line):
+        """
+        Gets the response to one request line.
+        """
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+        except (ValueError, AttributeError):
+            self.errors += 1
+            return {"id": None, "error": "Invalid request"}
+        if request.get("command") == "metrics":
+            return {"id": request_id, "metrics": self.metrics()}
+        self.requests += 1
+        try:
+            path = await self.query(
+                request["algorithm"], request["start"], request["end"]
+            )
+        except KeyError as error:
+            self.errors += 1
+            return {"id": request_id, "error": f"Unknown node or field: {error}"}
+        except Exception as error:
+            self.errors += 1
+            return {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+        return {"id": request_id, "path": path}
+
+
+def _resolve(future, result):
+    """
+    Sets the result of a future unless it was cancelled.
+    """
+    if not future.done():
+        future.set_result(result)
+
+
+def _reject(future, error):
+    """
+    Sets the exception of a future unless it was cancelled.
+    """
+    if not future.done():
+        future.set_exception(error)
+
+
+class PathQueryClient:
+    """
+    Sends queries to a PathQueryServer over its unix socket. Queries can be
+    awaited concurrently; they share the one connection and are matched to
+    their responses by id.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        """
+        Initializes the client. It does not connect until connect is
+        awaited.
+
+        Args:
+            socket_path (str): The unix socket the server listens on.
+        """
+        self.socket_path = socket_path
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._reader = None
+        self._writer = None
+        self._receiver = None
+
+    async def connect(self):
+        """
+        Connects to the server.
+        """
+        self._reader, self._writer = await asyncio.open_unix_connection(
+            self.socket_path
+        )
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    async def close(self):
+        """
+        Closes the connection. Queries still waiting fail with
+        ConnectionError.
+        """
+        self._writer.close()
+        await self._receiver
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def query(self, algorithm, start, end):
+        """
+        Asks the server for a path.
+
+        Args:
+            algorithm (str): A key of algorithms.ALGORITHMS.
+            start (str): The starting node.
+            end (str): The goal node.
+
+        Returns:
+            list or None: The path from start to end, or None if no path is
+                          found.
+
+        Raises:
+            ValueError: If the server could not answer the query.
+        """
+        response = await self._request(
+            {"algorithm": algorithm, "start": start, "end": end}
+        )
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["path"]
+
+    async def metrics(self):
+        """
+        Gets the server's metrics.
+
+        Returns:
+            dict: The metrics described in PathQueryServer.metrics.
+        """
+        return (await self._request({"command": "metrics"}))["metrics"]
+
+    async def _request(self, request):
+        """
+        Sends a request and waits for the response with the same id.
+        """
+        request["id"] = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request["id"]] = future
+        self._writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def _receive(self):
+        """
+        Hands each response to the query waiting for it.
+        """
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+            self._waiting.clear()
+
+
+async def _serve(args):
+    graph = load_graph(args.graph_file)
+    server = PathQueryServer(
+        graph,
+        graph.heuristic,
+        socket_path=args.socket,
+        workers=args.workers,
+        max_pending=args.max_pending,
+    )
+    async with server:
+        print(f"Serving {graph.node_count()} nodes on {args.socket}")
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("graph_file", help="a graph file written by write_graph")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-pending", type=int, default=1024)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
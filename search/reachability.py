@@ -0,0 +1,214 @@
+"""
+Implementation of a connected-component reachability index.
+"""
+
+from array import array
+
+from data_utils import CSRGraph
+from expand import expand
+
+
+class ReachabilityIndex:
+    """
+    Union-find over the nodes of a graph, joining the two ends of every
+    edge. Nodes in different components have no path between them in
+    either direction, so a search can answer such a pair at once instead of
+    exploring the whole component of start before returning None. Edges
+    are followed regardless of direction, so two nodes in one component
+    may still have no directed path between them; the index only ever
+    proves a path does not exist.
+
+    The index grows with the graph: add_edge joins two components in
+    near-constant time. If time_map has an add_listener method, as
+    VersionedTimeMap does, added edges are joined as they are set. Removed
+    edges are not split apart, which keeps every "unreachable" answer
+    correct but can leave components larger than they are; call rebuild to
+    recompute them.
+
+    Attributes:
+        time_map: The graph the index was built on.
+        ids: Dictionary mapping each node name to its id.
+        names: Node names indexed by id.
+        parents: Array of the union-find parent id of each node id.
+        sizes: Array of the component size of each root id.
+        component_count: Number of components.
+    """
+
+    def __init__(self, time_map):
+        """
+        Initializes a ReachabilityIndex, joining the ends of every edge.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+        """
+        self.time_map = time_map
+        self.rebuild()
+        if hasattr(time_map, "add_listener"):
+            time_map.add_listener(self.edge_changed)
+
+    def rebuild(self):
+        """
+        Recomputes the components from the current edges of the graph.
+        """
+        self.ids = {}
+        self.names = []
+        self.parents = array("i")
+        self.sizes = array("i")
+        self.component_count = 0
+        if isinstance(self.time_map, CSRGraph):
+            self._build_csr(self.time_map)
+            return
+        for node in self.time_map:
+            self.add_node(node)
+            for child_node in expand(node, self.time_map):
+                self.add_edge(node, child_node)
+
+    def add_node(self, node):
+        """
+        Adds a node as a component of its own, if it is new.
+
+        Args:
+            node (str): The node.
+
+        Returns:
+            int: The id of the node.
+        """
+        node_id = self.ids.get(node)
+        if node_id is None:
+            node_id = len(self.names)
+            self.ids[node] = node_id
+            self.names.append(node)
+            self.parents.append(node_id)
+            self.sizes.append(1)
+            self.component_count += 1
+        return node_id
+
+    def add_edge(self, source, target):
+        """
+        Joins the components of the two ends of an edge, adding the nodes if
+        they are new.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+        """
+        self._union(self.add_node(source), self.add_node(target))
+
+    def edge_changed(self, source, target):
+        """
+        Notifies the index that an edge was added, removed or reweighted.
+        Added edges are joined; removals are ignored until rebuild.
+
+        Args:
+            source (str): The source node.
+            target (str): The target node.
+        """
+        row = self.time_map.get(source) or {}
+        if row.get(target) is not None:
+            self.add_edge(source, target)
+
+    def connected(self, start, end):
+        """
+        Checks whether two nodes are in the same component. A False answer
+        means there is no path from start to end.
+
+        Args:
+            start (str): The starting node.
+            end (str): The goal node.
+
+        Returns:
+            bool: Whether a path from start to end may exist.
+        """
+        if start == end:
+            return True
+        start_id = self.ids.get(start)
+        end_id = self.ids.get(end)
+        if start_id is None or end_id is None:
+            return False
+        return self._find(start_id) == self._find(end_id)
+
+    def component_size(self, node):
+        """
+        Gets the number of nodes in the component of a node.
+
+        Args:
+            node (str): The node.
+
+        Returns:
+            int: The component size.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        return self.sizes[self._find(self.ids[node])]
+
+    def component_sizes(self):
+        """
+        Gets the size of every component.
+
+        Returns:
+            list: The component sizes, largest first.
+        """
+        return sorted(
+            (
+                self.sizes[node_id]
+                for node_id in range(len(self.names))
+                if self.parents[node_id] == node_id
+            ),
+            reverse=True,
+        )
+
+    def close(self):
+        """
+        Stops listening for changes to the graph.
+        """
+        if hasattr(self.time_map, "remove_listener"):
+            self.time_map.remove_listener(self.edge_changed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _build_csr(self, graph):
+        """
+        Builds the components of a CSRGraph over its own node ids.
+        """
+        self.names = list(graph.names)
+        self.ids = {name: node_id for node_id, name in enumerate(self.names)}
+        node_count = len(self.names)
+        self.parents = array("i", range(node_count))
+        self.sizes = array("i", [1]) * node_count
+        self.component_count = node_count
+        offsets, neighbors = graph.offsets, graph.neighbors
+        for node_id in range(node_count):
+            for child_id in neighbors[offsets[node_id] : offsets[node_id + 1]]:
+                self._union(node_id, child_id)
+
+    def _find(self, node_id):
+        """
+        Gets the root id of the component of a node id, halving the path to
+        it on the way.
+        """
+        parents = self.parents
+        while parents[node_id] != node_id:
+            parents[node_id] = parents[parents[node_id]]
+            node_id = parents[node_id]
+        return node_id
+
+    def _union(self, first_id, second_id):
+        """
+        Joins the components of two node ids, the smaller under the larger.
+        """
+        first_root = self._find(first_id)
+        second_root = self._find(second_id)
+        if first_root == second_root:
+            return
+        if self.sizes[first_root] < self.sizes[second_root]:
+            first_root, second_root = second_root, first_root
+        self.parents[second_root] = first_root
+        self.sizes[first_root] += self.sizes[second_root]
+        self.component_count -= 1
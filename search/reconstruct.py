@@ -0,0 +1,46 @@
+"""
+Defines helpers to rebuild a path from the parent pointers recorded
+during a search.
+"""
+
+
+def reconstruct_path(parents, end):
+    """
+    Rebuilds the path to a node by following a parent map back to the start.
+
+    Args:
+        parents (dict): A dictionary mapping each reached node to the node it
+                        was reached from. The start node maps to None.
+        end (str): The node to rebuild the path to.
+
+    Returns:
+        list: The path from the start node to end.
+    """
+    path = []
+    node = end
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+def unwind_path(link):
+    """
+    Rebuilds a path from a chain of (node, parent_link) pairs. Each frontier
+    entry holds one link, and links share their prefixes, so a chain costs
+    O(1) memory per entry instead of a full path copy.
+
+    Args:
+        link (tuple): The (node, parent_link) pair of the last node. The
+                      start node's parent_link is None.
+
+    Returns:
+        list: The path from the start node to the last node.
+    """
+    path = []
+    while link is not None:
+        node, link = link
+        path.append(node)
+    path.reverse()
+    return path
@@ -2,10 +2,63 @@
 Code to run and test all search algorithms.
 """
 
-from a_star import a_star_search
+import asyncio
+import os
+import pickle
+import tempfile
+
+from a_star import a_star_search, anytime_a_star_search, weighted_a_star_search
+from batch import many_to_many_search
+from beam_search import BREADTH_FIRST, beam_search
 from bfs import breadth_first_search
-from dfs import depth_first_search
+from bidirectional_a_star import bidirectional_a_star_search
+from bidirectional_bfs import bidirectional_breadth_first_search
+from contraction import ContractionHierarchy
+from data_utils import CSRGraph, HeapPriorityQueue, PriorityQueue, VersionedTimeMap
+from dfs import (
+    depth_first_search,
+    graph_depth_first_search,
+    iterative_deepening_search,
+)
+from graph_file import MAX_ESTIMATE, load_graph, write_graph
+from graph_generators import hop_dis_map, scale_free_graph
+from hop_table import HopTable
+from ida_star import ida_star_search
+from landmarks import Landmarks
+from level_bfs import breadth_first_levels, level_path
+from loaders import load_edge_list, load_hop_distances
+from lpa_star import LPAStarPlanner
+from parallel import ParallelSearchRunner
+from path_cache import PathCache
+from query_service import PathQueryClient, PathQueryServer
+from reachability import ReachabilityIndex
+from reorder import ORDERINGS, reorder
+from search_stats import SearchStats
 from tests import dis_map2, dis_mapM, time_map1, time_map2, time_mapM, time_mapT
+from ucs import ShortestPathTree, uniform_cost_search
+
+
+def path_cost(time_map, path):
+    """
+    Adds up the edge weights along a path; a missing edge raises KeyError.
+    """
+    return sum(time_map[source][target] for source, target in zip(path, path[1:]))
+
+
+async def query_service_paths(socket_path):
+    """
+    Sends the same A* query to a query server several times at once.
+    """
+    async with PathQueryServer(time_map2, dis_map2, socket_path, workers=2):
+        async with PathQueryClient(socket_path) as client:
+            paths = await asyncio.gather(
+                *[
+                    client.query("a_star", "John_Doe", "Alex_Robbinson")
+                    for _ in range(4)
+                ]
+            )
+            return paths, await client.metrics()
+
 
 if __name__ == "__main__":
     path = breadth_first_search(time_map1, "John_Stevens", "Mariana_Cardoso")
@@ -26,4 +79,304 @@ if __name__ == "__main__":
         "Benjamin_Walker",
         "Alex_Robbinson",
     ]
+    graph = CSRGraph.from_time_map(time_map1)
+    path = breadth_first_search(graph, "John_Stevens", "Mariana_Cardoso")
+    print(f"CSR BFS Path: {path}")
+    assert path == ["John_Stevens", "John_Doe", "Raj_Gupta", "Mariana_Cardoso"]
+    graph = CSRGraph.from_time_map(time_mapT)
+    path = depth_first_search(graph, "Alex_Robbinson", "Aaron_Stone")
+    print(f"CSR DFS Path: {path}")
+    assert path == ["Alex_Robbinson", "Walter_Walker", "Sarah_Parker", "Aaron_Stone"]
+    graph = CSRGraph.from_time_map(time_map2)
+    path = a_star_search(dis_map2, graph, "John_Doe", "Alex_Robbinson")
+    print(f"CSR A* Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    path = bidirectional_breadth_first_search(
+        time_map1, "John_Stevens", "Mariana_Cardoso"
+    )
+    print(f"Bidirectional BFS Path: {path}")
+    assert path == ["John_Stevens", "John_Doe", "Raj_Gupta", "Mariana_Cardoso"]
+    path = bidirectional_a_star_search(
+        dis_map2, time_map2, "John_Doe", "Alex_Robbinson"
+    )
+    print(f"Bidirectional A* Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    path = bidirectional_a_star_search(
+        dis_mapM, time_mapM, "Hannah_Mullard", "Alex_Robbinson"
+    )
+    print(f"Bidirectional A* Path: {path}")
+    assert path_cost(time_mapM, path) == path_cost(
+        time_mapM,
+        a_star_search(dis_mapM, time_mapM, "Hannah_Mullard", "Alex_Robbinson"),
+    )
+    paths = many_to_many_search(
+        time_map1,
+        [("John_Stevens", "Mariana_Cardoso"), ("John_Stevens", "Kim_Lee")],
+        weighted=False,
+    )
+    print(f"Batch BFS Paths: {paths}")
+    assert paths[("John_Stevens", "Mariana_Cardoso")] == [
+        "John_Stevens",
+        "John_Doe",
+        "Raj_Gupta",
+        "Mariana_Cardoso",
+    ]
+    assert paths[("John_Stevens", "Kim_Lee")] == ["John_Stevens", "Kim_Lee"]
+    paths = many_to_many_search(time_map2, [("John_Doe", "Alex_Robbinson")])
+    print(f"Batch Dijkstra Paths: {paths}")
+    assert paths[("John_Doe", "Alex_Robbinson")] == [
+        "John_Doe",
+        "John_Stevens",
+        "Walter_Walker",
+        "Alex_Robbinson",
+    ]
+    path = a_star_search(
+        Landmarks(time_map2, k=2), time_map2, "John_Doe", "Alex_Robbinson"
+    )
+    print(f"A* (landmarks) Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    hierarchy = ContractionHierarchy.build(time_map2)
+    path = hierarchy.shortest_path("John_Doe", "Alex_Robbinson")
+    print(f"Contraction hierarchy Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    path = ida_star_search(dis_mapM, time_mapM, "Hannah_Mullard", "Alex_Robbinson")
+    print(f"IDA* Path: {path}")
+    assert path_cost(time_mapM, path) == path_cost(
+        time_mapM,
+        a_star_search(dis_mapM, time_mapM, "Hannah_Mullard", "Alex_Robbinson"),
+    )
+    path = ida_star_search(
+        dis_map2, time_map2, "John_Doe", "Alex_Robbinson", cache_size=4
+    )
+    print(f"IDA* (cached) Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    with ParallelSearchRunner(time_map2, dis_map2, workers=2) as runner:
+        results = dict(
+            runner.run(
+                [
+                    ("a_star", "John_Doe", "Alex_Robbinson"),
+                    ("bfs", "John_Doe", "Mariana_Cardoso"),
+                ]
+            )
+        )
+    print(f"Parallel Paths: {results}")
+    assert results[("a_star", "John_Doe", "Alex_Robbinson")] == [
+        "John_Doe",
+        "John_Stevens",
+        "Walter_Walker",
+        "Alex_Robbinson",
+    ]
+    assert results[("bfs", "John_Doe", "Mariana_Cardoso")] == [
+        "John_Doe",
+        "Raj_Gupta",
+        "Mariana_Cardoso",
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "graph.bin")
+        write_graph(filename, time_map2, dis_map2)
+        graph = load_graph(filename)
+        path = a_star_search(graph.heuristic, graph, "John_Doe", "Alex_Robbinson")
+        heuristic, copied_graph = pickle.loads(pickle.dumps((graph.heuristic, graph)))
+        assert heuristic.graph is copied_graph
+        assert path == a_star_search(
+            heuristic, copied_graph, "John_Doe", "Alex_Robbinson"
+        )
+        copied_graph.close()
+        graph.close()
+    print(f"Mapped A* Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    with tempfile.TemporaryDirectory() as directory:
+        edges_file = os.path.join(directory, "edges.csv")
+        hops_file = os.path.join(directory, "hops.txt")
+        with open(edges_file, "w", encoding="utf-8") as file:
+            file.write("source,target,time\n")
+            for node, row in time_map2.items():
+                for neighbor, weight in row.items():
+                    if weight is not None:
+                        file.write(f"{node},{neighbor},{weight}\n")
+        with open(hops_file, "w", encoding="utf-8") as file:
+            file.write("# person person hops\n")
+            for node, row in dis_map2.items():
+                for goal, hops in row.items():
+                    file.write(f"{node} {goal} {hops}\n")
+        graph = load_edge_list(edges_file, delimiter=",", header=True)
+        hop_distances = load_hop_distances(hops_file, graph)
+    path = breadth_first_search(graph, "John_Doe", "Mariana_Cardoso")
+    print(f"Loaded BFS Path: {path}")
+    assert path == breadth_first_search(time_map2, "John_Doe", "Mariana_Cardoso")
+    path = a_star_search(hop_distances, graph, "John_Doe", "Alex_Robbinson")
+    print(f"Loaded A* Path: {path}")
+    assert path == a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson")
+    graph = scale_free_graph(300, seed=1)
+    assert list(graph.weights) == list(scale_free_graph(300, seed=1).weights)
+    path = breadth_first_search(graph, "Person_0", "Person_299")
+    print(f"Generated Graph BFS Path: {path}")
+    assert len(path) - 1 == hop_dis_map(graph)["Person_0"]["Person_299"]
+    disconnected_map = {"A": {"B": 1}, "B": {"A": 1}, "C": {}}
+    assert (
+        a_star_search(hop_dis_map(disconnected_map), disconnected_map, "A", "C") is None
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "disconnected.bin")
+        write_graph(filename, disconnected_map, hop_dis_map(disconnected_map))
+        graph = load_graph(filename)
+        assert graph.heuristic.estimate("A", "C") == MAX_ESTIMATE
+        assert a_star_search(graph.heuristic, graph, "B", "A") == ["B", "A"]
+        assert a_star_search(graph.heuristic, graph, "A", "C") is None
+        graph.close()
+    expanded_nodes = []
+    stats = SearchStats(on_expand=expanded_nodes.append)
+    path = a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson", stats)
+    print(f"A* Stats: {stats}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    assert stats.expanded == len(expanded_nodes) > 0
+    assert stats.peak_frontier <= stats.enqueued
+    versioned_map = VersionedTimeMap(time_map2)
+    with PathCache(versioned_map, dis_map2, max_entries=1) as cache:
+        path = cache.search("a_star", "John_Doe", "Alex_Robbinson")
+        assert cache.search("a_star", "John_Doe", "Alex_Robbinson") == path
+        assert (cache.hits, cache.misses) == (1, 1)
+        versioned_map.set_edge("John_Doe", "Alex_Robbinson", 1)
+        path = cache.search("a_star", "John_Doe", "Alex_Robbinson")
+        print(f"Cached A* Path: {path}, {cache.as_dict()}")
+        assert path == ["John_Doe", "Alex_Robbinson"]
+        assert (cache.misses, cache.invalidations) == (2, 1)
+        cache.search("bfs", "John_Doe", "Mariana_Cardoso")
+        assert cache.evictions == 1 and len(cache) == 1
+    versioned_map = VersionedTimeMap(time_map2)
+    with LPAStarPlanner(
+        dis_map2, versioned_map, "John_Doe", "Alex_Robbinson"
+    ) as planner:
+        assert planner.shortest_path() == a_star_search(
+            dis_map2, time_map2, "John_Doe", "Alex_Robbinson"
+        )
+        versioned_map.remove_edge("John_Stevens", "Walter_Walker")
+        path = planner.shortest_path()
+        print(f"Replanned LPA* Path: {path}")
+        assert path == a_star_search(
+            dis_map2, versioned_map, "John_Doe", "Alex_Robbinson"
+        )
+    planner = LPAStarPlanner(
+        dis_map2, CSRGraph.from_time_map(time_map2), "John_Doe", "Alex_Robbinson"
+    )
+    try:
+        planner.edge_changed("John_Doe", "Alex_Robbinson")
+        raise AssertionError("edge_changed accepted a CSRGraph")
+    except TypeError:
+        pass
+    graph = CSRGraph.from_time_map(time_map2)
+    distances, parents = breadth_first_levels(graph, "John_Doe")
+    path = level_path(graph, parents, "John_Doe", "Mariana_Cardoso")
+    print(f"Level BFS Path: {path}")
+    assert path == breadth_first_search(time_map2, "John_Doe", "Mariana_Cardoso")
+    assert distances[graph.id_of("Mariana_Cardoso")] == len(path) - 1
+    path = weighted_a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson", 2)
+    print(f"Weighted A* Path: {path}")
+    assert path[0] == "John_Doe" and path[-1] == "Alex_Robbinson"
+    assert path_cost(time_map2, path) <= 2 * path_cost(
+        time_map2, a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson")
+    )
+    results = list(
+        anytime_a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson")
+    )
+    print(f"Anytime A* Results: {results}")
+    assert all(cost == path_cost(time_map2, path) for path, cost, _ in results)
+    assert all(later[1] <= earlier[1] for earlier, later in zip(results, results[1:]))
+    assert results[-1][0] == [
+        "John_Doe",
+        "John_Stevens",
+        "Walter_Walker",
+        "Alex_Robbinson",
+    ]
+    assert results[-1][2] == 1
+    path, pruned = beam_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson", 100)
+    assert pruned == 0 and path == a_star_search(
+        dis_map2, time_map2, "John_Doe", "Alex_Robbinson"
+    )
+    path, pruned = beam_search(
+        dis_map2, time_map2, "John_Doe", "Alex_Robbinson", 1, BREADTH_FIRST
+    )
+    print(f"Beam Search Path: {path}, {pruned} pruned")
+    assert path[0] == "John_Doe" and path[-1] == "Alex_Robbinson" and pruned > 0
+    assert path_cost(time_map2, path) >= path_cost(
+        time_map2, a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson")
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        paths, metrics = asyncio.run(
+            query_service_paths(os.path.join(directory, "search.sock"))
+        )
+    print(f"Query Service Paths: {paths[0]}, {metrics}")
+    assert all(path == paths[0] for path in paths)
+    assert metrics["searches"] + metrics["coalesced"] == 4
+    path = graph_depth_first_search(time_mapT, "Alex_Robbinson", "Aaron_Stone")
+    print(f"Graph DFS Path: {path}")
+    assert path == depth_first_search(time_mapT, "Alex_Robbinson", "Aaron_Stone")
+    path = graph_depth_first_search({"A": {"B": 1}, "B": {"C": 2}}, "A", "C")
+    assert path == ["A", "B", "C"]
+    path = iterative_deepening_search(time_map1, "John_Stevens", "Mariana_Cardoso")
+    print(f"Iterative Deepening Path: {path}")
+    assert len(path) == len(
+        breadth_first_search(time_map1, "John_Stevens", "Mariana_Cardoso")
+    )
+    path = uniform_cost_search(time_map2, "John_Doe", "Alex_Robbinson")
+    print(f"UCS Path: {path}")
+    assert path == a_star_search(dis_map2, time_map2, "John_Doe", "Alex_Robbinson")
+    graph = CSRGraph.from_time_map(time_map2)
+    assert path == uniform_cost_search(graph, "John_Doe", "Alex_Robbinson")
+    rowless_map = {"A": {"B": 1, "C": 5}, "B": {"C": 2}}
+    assert uniform_cost_search(rowless_map, "A", "C") == ["A", "B", "C"]
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "John_Doe.spt")
+        ShortestPathTree.build(time_map2, "John_Doe").save(filename)
+        tree = ShortestPathTree.load(filename)
+    print(f"Shortest-path tree Path: {tree.path_to('Alex_Robbinson')}")
+    assert tree.path_to("Alex_Robbinson") == path
+    assert tree.distance_to("John_Doe") == 0
+    versioned_map = VersionedTimeMap(time_map1)
+    versioned_map.set_edge("Nobody", "Nobody_Else", 1)
+    with ReachabilityIndex(versioned_map) as index:
+        print(f"Component sizes: {index.component_sizes()}")
+        assert index.component_sizes() == [len(time_map1), 2]
+        stats = SearchStats()
+        path = breadth_first_search(
+            versioned_map, "John_Stevens", "Nobody", stats, reachability=index
+        )
+        assert path is None and stats.expanded == 0
+        versioned_map.set_edge("Mariana_Cardoso", "Nobody", 1)
+        assert index.component_count == 1
+    path = a_star_search(
+        dis_map2,
+        time_map2,
+        "John_Doe",
+        "Alex_Robbinson",
+        reachability=ReachabilityIndex(time_map2),
+    )
+    print(f"A* (reachability) Path: {path}")
+    assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+    table = HopTable.build(time_mapM, block_size=4)
+    print(f"Hop table: {table.hops.typecode} x {len(table.hops)}")
+    assert all(
+        table.estimate(node, goal) == hops
+        for node, row in hop_dis_map(time_mapM).items()
+        for goal, hops in row.items()
+    )
+    path = a_star_search(table, time_mapM, "Hannah_Mullard", "Alex_Robbinson")
+    print(f"A* (hop table) Path: {path}")
+    assert path_cost(time_mapM, path) == path_cost(
+        time_mapM,
+        a_star_search(dis_mapM, time_mapM, "Hannah_Mullard", "Alex_Robbinson"),
+    )
+    for method in ORDERINGS:
+        graph = reorder(time_map2, method)
+        path = a_star_search(dis_map2, graph, "John_Doe", "Alex_Robbinson")
+        print(f"A* ({method} order) Path: {path}")
+        assert path == ["John_Doe", "John_Stevens", "Walter_Walker", "Alex_Robbinson"]
+        assert breadth_first_search(
+            graph, "John_Stevens", "Mariana_Cardoso"
+        ) == breadth_first_search(time_map2, "John_Stevens", "Mariana_Cardoso")
+    for queue in (PriorityQueue(), HeapPriorityQueue()):
+        queue.enqueue("John_Doe", None, 5, 0)
+        queue.enqueue("Kim_Lee", None, 5, 0)
+        queue.enqueue("John_Doe", ["John_Doe"], 5, 0)
+        assert queue.dequeue() == ("John_Doe", ["John_Doe"])
     print("All passed.")
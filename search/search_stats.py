@@ -0,0 +1,121 @@
+"""
+Defines SearchStats, the optional statistics and tracing hooks of a search.
+"""
+
+import time
+
+
+class SearchStats:
+    """
+    Collects counters for one search and calls optional hooks on its
+    expand and enqueue events. Searches take it as an optional stats
+    argument and only touch it when it is given, so a search without one
+    pays a single None check per event.
+
+    Attributes:
+        expanded: Number of nodes expanded.
+        enqueued: Number of nodes added to the frontier.
+        updated: Number of frontier nodes whose path or priority changed.
+        duplicates: Number of children rejected because they were already
+                    in the frontier or explored.
+        peak_frontier: Largest frontier size seen.
+        wall_time: Seconds the search took.
+        on_expand: Optional callable(node) called before a node is expanded.
+        on_enqueue: Optional callable(node, frontier_size) called after a
+                    node is added to the frontier.
+    """
+
+    def __init__(self, on_expand=None, on_enqueue=None):
+        """
+        Initializes SearchStats with all counters at 0.
+
+        Args:
+            on_expand (callable): Optional expand hook.
+            on_enqueue (callable): Optional enqueue hook.
+        """
+        self.expanded = 0
+        self.enqueued = 0
+        self.updated = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.wall_time = 0.0
+        self.on_expand = on_expand
+        self.on_enqueue = on_enqueue
+        self._started = None
+
+    def start(self):
+        """
+        Starts the wall-time clock.
+        """
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """
+        Stops the wall-time clock and adds the elapsed time to wall_time.
+        """
+        if self._started is not None:
+            self.wall_time += time.perf_counter() - self._started
+            self._started = None
+
+    def expand(self, node):
+        """
+        Records that a node is about to be expanded.
+
+        Args:
+            node (str): The node.
+        """
+        self.expanded += 1
+        if self.on_expand is not None:
+            self.on_expand(node)
+
+    def enqueue(self, node, frontier_size):
+        """
+        Records that a node was added to the frontier.
+
+        Args:
+            node (str): The node.
+            frontier_size (int): The size of the frontier after adding it.
+        """
+        self.enqueued += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if self.on_enqueue is not None:
+            self.on_enqueue(node, frontier_size)
+
+    def update(self, node):
+        """
+        Records that a node already in the frontier was given a better path.
+
+        Args:
+            node (str): The node.
+        """
+        self.updated += 1
+
+    def duplicate(self, node):
+        """
+        Records that a child was rejected as already seen.
+
+        Args:
+            node (str): The node.
+        """
+        self.duplicates += 1
+
+    def as_dict(self):
+        """
+        Gets the counters as a dictionary, e.g. for logging or JSON.
+
+        Returns:
+            dict: The counters and wall time keyed by attribute name.
+        """
+        return {
+            "expanded": self.expanded,
+            "enqueued": self.enqueued,
+            "updated": self.updated,
+            "duplicates": self.duplicates,
+            "peak_frontier": self.peak_frontier,
+            "wall_time": self.wall_time,
+        }
+
+    def __repr__(self):
+        counters = ", ".join(f"{key}={value}" for key, value in self.as_dict().items())
+        return f"SearchStats({counters})"
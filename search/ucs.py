@@ -0,0 +1,287 @@
+"""
+Implementation of uniform-cost search and shortest-path trees.
+"""
+
+import heapq
+import itertools
+import pickle
+from array import array
+
+from data_utils import CSRGraph
+from expand import expand_with_costs
+from reconstruct import reconstruct_path
+
+INFINITY = float("inf")
+NO_PREDECESSOR = -1
+
+
+def uniform_cost_search(time_map, start, end, stats=None):
+    """
+    Performs Uniform-Cost Search (Dijkstra's algorithm) to find the cheapest
+    path from start to end using the time_map weights alone, so no dis_map
+    is needed. Nodes are settled in order of their cost from start and the
+    search stops as soon as end is settled, so only the nodes cheaper than
+    end are expanded. A CSRGraph is searched over its node ids and a
+    dictionary over its rows, keeping only the parent of each reached node.
+
+    Args:
+        time_map (dict or CSRGraph): A dictionary containing the similarity
+                                     map, or a compiled CSRGraph.
+        start (str): The starting node.
+        end (str): The goal node.
+        stats (SearchStats): Optional statistics to record into.
+
+    Returns:
+        list or None: The shortest path from start to end, or None if no path
+                      is found.
+    """
+    if stats is not None:
+        stats.start()
+    if not isinstance(time_map, CSRGraph):
+        path = _search_map(time_map, start, end, stats)
+        if stats is not None:
+            stats.stop()
+        return path
+    graph = time_map
+    start_id = graph.id_of(start)
+    end_id = graph.ids.get(end)
+    if end_id is None:
+        if stats is not None:
+            stats.stop()
+        return None
+    distances, predecessors = shortest_path_arrays(graph, start_id, [end_id], stats)
+    if stats is not None:
+        stats.stop()
+    return ShortestPathTree(
+        graph.names, start, distances, predecessors, graph.ids
+    ).path_to(end)
+
+
+class ShortestPathTree:
+    """
+    Represents the cheapest paths from one source to every node, as computed
+    by running uniform-cost search to completion. Once built, or loaded from
+    disk, it answers path and cost queries from its source by following
+    predecessors, without searching.
+
+    Attributes:
+        names: Node names indexed by node id.
+        ids: Dictionary mapping each node name to its id.
+        source: The source node.
+        distances: Array of the cost from source to each node id; unreachable
+                   nodes are infinite.
+        predecessors: Array of the id of the node before each node id on its
+                      cheapest path, or NO_PREDECESSOR for the source and
+                      unreachable nodes.
+    """
+
+    def __init__(self, names, source, distances, predecessors, ids=None):
+        """
+        Initializes a ShortestPathTree from already computed arrays.
+
+        Args:
+            names (list): Node names indexed by node id.
+            source (str): The source node.
+            distances (array): The cost to each node id.
+            predecessors (array): The predecessor id of each node id.
+            ids (dict): Optional name to id mapping; built from names if
+                        not given.
+        """
+        self.names = names
+        if ids is None:
+            ids = {name: node_id for node_id, name in enumerate(names)}
+        self.ids = ids
+        self.source = source
+        self.distances = distances
+        self.predecessors = predecessors
+
+    @classmethod
+    def build(cls, time_map, source):
+        """
+        Runs uniform-cost search from source over the whole graph.
+
+        Args:
+            time_map (dict or CSRGraph): A dictionary containing the
+                                         similarity map, or a compiled
+                                         CSRGraph.
+            source (str): The source node.
+
+        Returns:
+            ShortestPathTree: The tree.
+        """
+        graph = _compiled(time_map)
+        distances, predecessors = shortest_path_arrays(graph, graph.id_of(source))
+        return cls(list(graph.names), source, distances, predecessors)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads a tree written by save().
+
+        Args:
+            filename (str): The file to read.
+
+        Returns:
+            ShortestPathTree: The loaded tree.
+        """
+        with open(filename, "rb") as file:
+            state = pickle.load(file)
+        return cls(
+            state["names"], state["source"], state["distances"], state["predecessors"]
+        )
+
+    def save(self, filename):
+        """
+        Writes the tree to disk.
+
+        Args:
+            filename (str): The file to write.
+        """
+        state = {
+            "names": self.names,
+            "source": self.source,
+            "distances": self.distances,
+            "predecessors": self.predecessors,
+        }
+        with open(filename, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def distance_to(self, end):
+        """
+        Gets the cost of the cheapest path from the source to a node.
+
+        Args:
+            end (str): The goal node.
+
+        Returns:
+            float: The cost, or infinity if end cannot be reached.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        return self.distances[self.ids[end]]
+
+    def path_to(self, end):
+        """
+        Gets the cheapest path from the source to a node.
+
+        Args:
+            end (str): The goal node.
+
+        Returns:
+            list or None: The path from the source to end, or None if end
+                          cannot be reached.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        node_id = self.ids[end]
+        if self.distances[node_id] == INFINITY:
+            return None
+        path = []
+        while node_id != NO_PREDECESSOR:
+            path.append(self.names[node_id])
+            node_id = self.predecessors[node_id]
+        path.reverse()
+        return path
+
+
+def shortest_path_arrays(graph, source_id, target_ids=None, stats=None):
+    """
+    Runs Dijkstra's algorithm over node ids from one source, on a binary
+    heap of (cost, id) entries where stale entries are skipped when they
+    surface. It runs to completion, or stops once every id in target_ids
+    is settled; the entries of settled nodes are then final and those of
+    the rest are upper bounds.
+
+    Args:
+        graph (CSRGraph): The graph to search.
+        source_id (int): The id of the source node.
+        target_ids (iterable): Optional ids to stop after settling.
+        stats (SearchStats): Optional statistics to record into.
+
+    Returns:
+        tuple: Arrays (distances, predecessors) indexed by node id.
+               Unreached nodes are infinitely far and have NO_PREDECESSOR,
+               as does the source.
+    """
+    names = graph.names
+    offsets, neighbors, weights = graph.offsets, graph.neighbors, graph.weights
+    distances = array("d", [INFINITY]) * graph.node_count()
+    predecessors = array("i", [NO_PREDECESSOR]) * graph.node_count()
+    pending = None if target_ids is None else set(target_ids)
+    distances[source_id] = 0
+    heap = [(0, source_id)]
+    if stats is not None:
+        stats.enqueue(names[source_id], 1)
+    while heap:
+        distance, node_id = heapq.heappop(heap)
+        if distance > distances[node_id]:
+            continue
+        if pending is not None:
+            pending.discard(node_id)
+            if not pending:
+                break
+        if stats is not None:
+            stats.expand(names[node_id])
+        for index in range(offsets[node_id], offsets[node_id + 1]):
+            neighbor_id = neighbors[index]
+            new_distance = distance + weights[index]
+            if new_distance < distances[neighbor_id]:
+                if stats is not None and distances[neighbor_id] < INFINITY:
+                    stats.update(names[neighbor_id])
+                elif stats is not None:
+                    stats.enqueue(names[neighbor_id], len(heap) + 1)
+                distances[neighbor_id] = new_distance
+                predecessors[neighbor_id] = node_id
+                heapq.heappush(heap, (new_distance, neighbor_id))
+            elif stats is not None:
+                stats.duplicate(names[neighbor_id])
+    return distances, predecessors
+
+
+def _search_map(time_map, start, end, stats):
+    """
+    Runs Dijkstra's algorithm from start on a dictionary until end is
+    settled. Heap entries carry a sequence number so ties never compare
+    node names, and nodes without a row of their own have no children.
+    """
+    sequence = itertools.count()
+    distances = {start: 0}
+    parents = {start: None}
+    heap = [(0, next(sequence), start)]
+    if stats is not None:
+        stats.enqueue(start, 1)
+    while heap:
+        distance, _, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        if node == end:
+            return reconstruct_path(parents, end)
+        if node not in time_map:
+            continue
+        if stats is not None:
+            stats.expand(node)
+        for neighbor, cost in expand_with_costs(node, time_map):
+            new_distance = distance + cost
+            old_distance = distances.get(neighbor)
+            if old_distance is None or new_distance < old_distance:
+                if stats is not None and old_distance is not None:
+                    stats.update(neighbor)
+                elif stats is not None:
+                    stats.enqueue(neighbor, len(heap) + 1)
+                distances[neighbor] = new_distance
+                parents[neighbor] = node
+                heapq.heappush(heap, (new_distance, next(sequence), neighbor))
+            elif stats is not None:
+                stats.duplicate(neighbor)
+    return None
+
+
+def _compiled(time_map):
+    """
+    Gets a time_map as a CSRGraph, compiling a dictionary.
+    """
+    if isinstance(time_map, CSRGraph):
+        return time_map
+    return CSRGraph.from_time_map(time_map)